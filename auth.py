@@ -9,8 +9,11 @@ This module provides environment-based authentication switching between:
 Set AUTH_TYPE environment variable to choose authentication mode.
 """
 
+import functools
 import os
-from typing import Any
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Any, Final
 
 import structlog
 from langgraph_sdk import Auth
@@ -23,26 +26,57 @@ auth = Auth()
 # Get authentication type from environment
 AUTH_TYPE = os.getenv("AUTH_TYPE", "noop").lower()
 
+# Header keys probed for credentials, in each handler's lookup order
+_CUSTOM_HEADER_KEYS = (
+    "authorization",
+    "Authorization",
+    b"authorization",
+    b"Authorization",
+)
+_KEYCLOAK_HEADER_KEYS = (
+    "authorization",
+    "Authorization",
+    "x-api-key",
+    "X-Api-Key",
+    b"authorization",
+    b"Authorization",
+)
+
+
+def _extract_authorization(
+    headers: dict[Any, Any], keys: tuple[Any, ...]
+) -> str | None:
+    """Return the first value found under `keys`, decoded to str, or None."""
+    for key in keys:
+        value = headers.get(key)
+        if value:
+            return value.decode("utf-8") if isinstance(value, bytes) else value
+    return None
+
+
 if AUTH_TYPE == "noop":
     logger.info("Using noop authentication (no auth required)")
 
+    # Shared across requests so the noop path allocates nothing per call
+    _NOOP_USER: Final[Auth.types.MinimalUserDict] = {
+        "identity": "anonymous",
+        "display_name": "Anonymous User",
+        "is_authenticated": True,
+    }
+    _EMPTY_FILTER: Final[dict[str, Any]] = {}  # Empty filter = no access restrictions
+
     @auth.authenticate
-    async def authenticate(headers: dict[str, str]) -> Auth.types.MinimalUserDict:
+    async def authenticate(headers: dict[str, str]) -> Auth.types.MinimalUserDict:  # noqa: ARG001
         """No-op authentication that allows all requests."""
-        _ = headers  # Suppress unused warning
-        return {
-            "identity": "anonymous",
-            "display_name": "Anonymous User",
-            "is_authenticated": True,
-        }
+        return _NOOP_USER
 
     @auth.on
     async def authorize(
-        ctx: Auth.types.AuthContext, value: dict[str, Any]
+        ctx: Auth.types.AuthContext,  # noqa: ARG001
+        value: dict[str, Any],  # noqa: ARG001
     ) -> dict[str, Any]:
         """No-op authorization that allows access to all resources."""
-        _ = ctx, value  # Suppress unused warnings
-        return {}  # Empty filter = no access restrictions
+        return _EMPTY_FILTER
 
 elif AUTH_TYPE == "custom":
     logger.info("Using custom authentication")
@@ -54,17 +88,7 @@ elif AUTH_TYPE == "custom":
 
         Modify this function to integrate with your authentication service.
         """
-        # Extract authorization header
-        authorization = (
-            headers.get("authorization")
-            or headers.get("Authorization")
-            or headers.get(b"authorization")
-            or headers.get(b"Authorization")
-        )
-
-        # Handle bytes headers
-        if isinstance(authorization, bytes):
-            authorization = authorization.decode("utf-8")
+        authorization = _extract_authorization(headers, _CUSTOM_HEADER_KEYS)
 
         if not authorization:
             logger.warning("Missing Authorization header")
@@ -114,15 +138,11 @@ elif AUTH_TYPE == "custom":
                     status_code=401, detail="Invalid user identity"
                 )
 
-            # Create owner filter for resource access control
-            owner_filter = {"owner": user_id}
-
             # Add owner information to metadata for create/update operations
-            metadata = value.setdefault("metadata", {})
-            metadata.update(owner_filter)
+            value.setdefault("metadata", {})["owner"] = user_id
 
             # Return filter for database operations
-            return owner_filter
+            return {"owner": user_id}
 
         except Auth.exceptions.HTTPException:
             raise
@@ -145,19 +165,7 @@ elif AUTH_TYPE == "keycloak":
 
         Validates JWT tokens with Keycloak and extracts user claims.
         """
-        # Extract authorization header
-        authorization = (
-            headers.get("authorization")
-            or headers.get("Authorization")
-            or headers.get("x-api-key")
-            or headers.get("X-Api-Key")
-            or headers.get(b"authorization")
-            or headers.get(b"Authorization")
-        )
-
-        # Handle bytes headers
-        if isinstance(authorization, bytes):
-            authorization = authorization.decode("utf-8")
+        authorization = _extract_authorization(headers, _KEYCLOAK_HEADER_KEYS)
 
         if not authorization:
             logger.warning("Missing Authorization header")
@@ -165,13 +173,9 @@ elif AUTH_TYPE == "keycloak":
                 status_code=401, detail="Authorization header required"
             )
 
-        # Extract token from Bearer format
-        token = None
-        if authorization.startswith("Bearer "):
-            token = authorization[7:]  # Remove "Bearer " prefix
-        else:
-            # Support direct token for X-Api-Key compatibility
-            token = authorization
+        # Extract token from Bearer format; a raw token is accepted as-is
+        # for X-Api-Key compatibility
+        token = authorization.removeprefix("Bearer ")
 
         if not token:
             raise Auth.exceptions.HTTPException(
@@ -216,24 +220,26 @@ elif AUTH_TYPE == "keycloak":
         metadata["owner"] = user_id
         logger.debug(f"Thread creation by user: {user_id}")
 
+    @functools.lru_cache(maxsize=4096)
+    def _owner_filter(user_id: str) -> Mapping[str, str]:
+        """Shared read-only owner filter, built once per user"""
+        return MappingProxyType({"owner": user_id})
+
     @auth.on.threads.read
     async def on_thread_read(ctx: Auth.types.AuthContext, value: dict[str, Any]):
         """Verify thread ownership before read"""
-        user_id = ctx.user.identity
         # Return filter to only show user's own threads
-        return {"owner": user_id}
+        return _owner_filter(ctx.user.identity)
 
     @auth.on.threads.update
     async def on_thread_update(ctx: Auth.types.AuthContext, value: dict[str, Any]):
         """Verify ownership before update"""
-        user_id = ctx.user.identity
-        return {"owner": user_id}
+        return _owner_filter(ctx.user.identity)
 
     @auth.on.threads.delete
     async def on_thread_delete(ctx: Auth.types.AuthContext, value: dict[str, Any]):
         """Verify ownership before delete"""
-        user_id = ctx.user.identity
-        return {"owner": user_id}
+        return _owner_filter(ctx.user.identity)
 
 else:
     raise ValueError(
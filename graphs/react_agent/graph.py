@@ -34,62 +34,77 @@ register_all_local_tools()
 local_tools = get_all_tool()
 all_tools = local_tools  # Direct reference, will be replaced by async_loader
 
-# Models
-primary_model = init_chat_model(
-    model=PRIMARY_MODEL_ID,
-    model_provider="google_genai",
-    api_key=GEMINI_API_KEY,
-    temperature=0.7,
-    max_tokens=4096,
-    streaming=False,
-)
+# Models (created on first use so importing this module stays cheap)
+_primary_model = None
+_fallback_model = None
+
+
+def get_primary_model():
+    global _primary_model
+    if _primary_model is None:
+        _primary_model = init_chat_model(
+            model=PRIMARY_MODEL_ID,
+            model_provider="google_genai",
+            api_key=GEMINI_API_KEY,
+            temperature=0.7,
+            max_tokens=4096,
+            streaming=False,
+        )
+    return _primary_model
 
-fallback_model = init_chat_model(
-    model=FALLBACK_MODEL_ID,
-    model_provider="google_genai",
-    api_key=GEMINI_API_KEY,
-    temperature=0.7,
-    max_tokens=4096,
-    streaming=False,
-)
 
-# Middleware
-middlewares = [
-    SummarizationMiddleware(
-        model=fallback_model,
-        max_tokens_before_summary=30000,
-    ),
-    ModelCallLimitMiddleware(thread_limit=50, run_limit=20, exit_behavior="end"),
-    ToolCallLimitMiddleware(thread_limit=20, run_limit=20, exit_behavior="continue"),
-    ModelFallbackMiddleware(fallback_model),
-    TodoListMiddleware(),
-    ToolRetryMiddleware(
-        max_retries=3,
-        backoff_factor=2.0,
-        initial_delay=1.0,
-    ),
-    ContextEditingMiddleware(
-        edits=[
-            ClearToolUsesEdit(
-                trigger=2000,
-                keep=3,
-                clear_tool_inputs=False,
-                placeholder="[cleared]",
-            ),
-        ]
-    ),
-]
+def get_fallback_model():
+    global _fallback_model
+    if _fallback_model is None:
+        _fallback_model = init_chat_model(
+            model=FALLBACK_MODEL_ID,
+            model_provider="google_genai",
+            api_key=GEMINI_API_KEY,
+            temperature=0.7,
+            max_tokens=4096,
+            streaming=False,
+        )
+    return _fallback_model
+
+
+def _build_middlewares():
+    """Build the middleware stack. Kept out of import time; see _create_agent."""
+    fallback_model = get_fallback_model()
+    return [
+        SummarizationMiddleware(
+            model=fallback_model,
+            max_tokens_before_summary=30000,
+        ),
+        ModelCallLimitMiddleware(thread_limit=50, run_limit=20, exit_behavior="end"),
+        ToolCallLimitMiddleware(thread_limit=20, run_limit=20, exit_behavior="continue"),
+        ModelFallbackMiddleware(fallback_model),
+        TodoListMiddleware(),
+        ToolRetryMiddleware(
+            max_retries=3,
+            backoff_factor=2.0,
+            initial_delay=1.0,
+        ),
+        ContextEditingMiddleware(
+            edits=[
+                ClearToolUsesEdit(
+                    trigger=2000,
+                    keep=3,
+                    clear_tool_inputs=False,
+                    placeholder="[cleared]",
+                ),
+            ]
+        ),
+    ]
+
 
 def _create_agent():
     """Create agent with current tools. Called after async loaders complete."""
-    import sys
-    current_module = sys.modules[__name__]
-    tools = getattr(current_module, 'all_tools', local_tools)
-    
+    tools = globals().get("all_tools", local_tools)
+
     return create_agent(
-        model=primary_model,
+        model=get_primary_model(),
         tools=tools,
-        middleware=middlewares,
+        middleware=_build_middlewares(),
     )
 
 def __post_async_load__():
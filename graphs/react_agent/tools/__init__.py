@@ -1,7 +1,7 @@
 from __future__ import annotations
 from .think import register as register_think
-from .tool_registry import add_tool, has_tool, get_all_tool
-from .mcp import create_mcp_client
+from .tool_registry import add_tool, add_tools, has_tool, get_all_tool
+from .mcp import create_mcp_client, get_mcp_client
 
 
 def register_all_local_tools():
@@ -11,7 +11,9 @@ def register_all_local_tools():
 __all__ = [
     "register_all_local_tools",
     "add_tool",
+    "add_tools",
     "has_tool",
     "get_all_tool",
     "create_mcp_client",
+    "get_mcp_client",
 ]
@@ -1,15 +1,17 @@
 from __future__ import annotations
 
 from abc import ABC
-from typing import Any, Optional
-from pydantic import Field
+from typing import Any
+from pydantic import ConfigDict, Field
 from langchain_core.tools import BaseTool
 
 
 class AppTool(BaseTool, ABC):
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     name: str = Field(..., description="Tên tool")
     description: str = Field(..., description="Mô tả công dụng tool")
-    timeout: Optional[float] = Field(
+    timeout: float | None = Field(
         default=None,
         description="Timeout (giây) cho một lần chạy tool. None = không giới hạn.",
     )
@@ -3,9 +3,14 @@ import os
 import asyncio
 from typing import Any
 from functools import wraps
+import structlog
 from langchain_mcp_adapters.client import MultiServerMCPClient
 from langchain_core.tools import StructuredTool
 
+from .tool_registry import add_tools, get_all_tool
+
+logger = structlog.get_logger(__name__)
+
 MCP_URL = os.getenv("AML_MCP_URL", "http://localhost:5000/mcp")
 MCP_SERVER_NAME = os.getenv("AML_MCP_SERVER_NAME", "aml-mcp")
 
@@ -21,16 +26,30 @@ def create_mcp_client() -> MultiServerMCPClient:
     return client
 
 
+_mcp_client: MultiServerMCPClient | None = None
+_mcp_lock = asyncio.Lock()
+
+
+async def get_mcp_client() -> MultiServerMCPClient:
+    """Return the shared MCP client, creating it on first use"""
+    global _mcp_client
+    if _mcp_client is None:
+        async with _mcp_lock:
+            if _mcp_client is None:
+                _mcp_client = create_mcp_client()
+    return _mcp_client
+
+
 async def get_mcp_tools_async():
     """Async function to get MCP tools"""
     
-    mcp_client = create_mcp_client()
+    mcp_client = await get_mcp_client()
     
     try:
         tools = await mcp_client.get_tools()
         return tools
     except Exception as e:
-        print(f"[MCP] Failed to get tools: {e}")
+        logger.warning("Failed to get MCP tools", error=str(e))
         return []
 
 
@@ -38,7 +57,7 @@ async def load_mcp_tools(module: Any, graph_id: str):
     """Async loader function called by AsyncModuleLoader"""
     mcp_tools = await get_mcp_tools_async()
     if mcp_tools and hasattr(module, "all_tools"):
-        local_tools = getattr(module, "local_tools", [])
-        module.all_tools = [*local_tools, *mcp_tools]
-        print(f"[MCP] ✅ Loaded {len(mcp_tools)} MCP tools for '{graph_id}'")
+        add_tools({t.name: t for t in mcp_tools})
+        module.all_tools = get_all_tool()
+        logger.info("Loaded MCP tools", count=len(mcp_tools), graph_id=graph_id)
 
@@ -1,11 +1,11 @@
 from __future__ import annotations
 from langchain_core.tools import tool
 from .params import ThinkToolParams
-from .tool_registry import add_tool
+from .tool_registry import add_tools
 
 
 def register():
-    add_tool("think", think)
+    add_tools({"think": think})
 
 
 @tool(args_schema=ThinkToolParams)
@@ -1,17 +1,31 @@
 from __future__ import annotations
+from collections.abc import Mapping, Sequence
 from typing import Dict
 from langchain_core.tools import BaseTool, StructuredTool
 
 __tool_registry: Dict[str, StructuredTool] = {}
+# Read-only view of the registry, rebuilt lazily after registration changes
+__tool_snapshot: tuple[BaseTool, ...] | None = None
 
 
 def add_tool(tool_name: str, tool: StructuredTool):
+    global __tool_snapshot
     __tool_registry[tool_name] = tool
+    __tool_snapshot = None
+
+
+def add_tools(tools: Mapping[str, StructuredTool]):
+    global __tool_snapshot
+    __tool_registry.update(tools)
+    __tool_snapshot = None
 
 
 def has_tool(tool_name: str) -> bool:
     return tool_name in __tool_registry
 
 
-def get_all_tool() -> list[BaseTool]:
-    return list(__tool_registry.values())
+def get_all_tool() -> Sequence[BaseTool]:
+    global __tool_snapshot
+    if __tool_snapshot is None:
+        __tool_snapshot = tuple(__tool_registry.values())
+    return __tool_snapshot
@@ -15,6 +15,7 @@ import asyncio
 import os
 
 import httpx
+import orjson
 import structlog
 from dotenv import load_dotenv
 
@@ -30,10 +31,11 @@ structlog.configure(
 logger = structlog.get_logger(__name__)
 
 
-async def get_admin_token(keycloak_url: str) -> str | None:
+async def get_admin_token(client: httpx.AsyncClient, keycloak_url: str) -> str | None:
     """Get admin access token from Keycloak.
     
     Args:
+        client: Shared HTTP client
         keycloak_url: Keycloak server URL
         
     Returns:
@@ -42,34 +44,36 @@ async def get_admin_token(keycloak_url: str) -> str | None:
     token_url = f"{keycloak_url}/realms/master/protocol/openid-connect/token"
 
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                token_url,
-                data={
-                    "client_id": "admin-cli",
-                    "username": "admin",
-                    "password": "admin",
-                    "grant_type": "password",
-                },
-                timeout=10.0,
-            )
-
-            if response.status_code == 200:
-                return response.json()["access_token"]
-            else:
-                logger.error(f"Failed to get admin token: {response.status_code}")
-                logger.error(f"Response: {response.text}")
-                return None
+        response = await client.post(
+            token_url,
+            data={
+                "client_id": "admin-cli",
+                "username": "admin",
+                "password": "admin",
+                "grant_type": "password",
+            },
+            timeout=10.0,
+        )
+
+        if response.status_code == 200:
+            return orjson.loads(response.content)["access_token"]
+        else:
+            logger.error(f"Failed to get admin token: {response.status_code}")
+            logger.error(f"Response: {response.text}")
+            return None
 
     except Exception as e:
         logger.error(f"Failed to connect to Keycloak: {e}")
         return None
 
 
-async def create_realm(keycloak_url: str, token: str, realm_name: str) -> bool:
+async def create_realm(
+    client: httpx.AsyncClient, keycloak_url: str, token: str, realm_name: str
+) -> bool:
     """Create realm in Keycloak.
     
     Args:
+        client: Shared HTTP client
         keycloak_url: Keycloak server URL
         token: Admin access token
         realm_name: Realm name to create
@@ -78,37 +82,29 @@ async def create_realm(keycloak_url: str, token: str, realm_name: str) -> bool:
         True if successful
     """
     try:
-        async with httpx.AsyncClient() as client:
-            # Check if realm exists
-            check_response = await client.get(
-                f"{keycloak_url}/admin/realms/{realm_name}",
-                headers={"Authorization": f"Bearer {token}"},
-            )
-
-            if check_response.status_code == 200:
-                logger.info(f"✅ Realm '{realm_name}' already exists")
-                return True
-
-            # Create realm
-            response = await client.post(
-                f"{keycloak_url}/admin/realms",
-                headers={
-                    "Authorization": f"Bearer {token}",
-                    "Content-Type": "application/json",
-                },
-                json={
-                    "realm": realm_name,
-                    "enabled": True,
-                },
-            )
-
-            if response.status_code in [201, 409]:
-                logger.info(f"✅ Realm '{realm_name}' created")
-                return True
-            else:
-                logger.error(f"Failed to create realm: {response.status_code}")
-                logger.error(f"Response: {response.text}")
-                return False
+        # Create realm (409 means it already exists)
+        response = await client.post(
+            f"{keycloak_url}/admin/realms",
+            headers={
+                "Authorization": f"Bearer {token}",
+                "Content-Type": "application/json",
+            },
+            json={
+                "realm": realm_name,
+                "enabled": True,
+            },
+        )
+
+        if response.status_code == 201:
+            logger.info(f"✅ Realm '{realm_name}' created")
+            return True
+        elif response.status_code == 409:
+            logger.info(f"✅ Realm '{realm_name}' already exists")
+            return True
+        else:
+            logger.error(f"Failed to create realm: {response.status_code}")
+            logger.error(f"Response: {response.text}")
+            return False
 
     except Exception as e:
         logger.error(f"Failed to create realm: {e}")
@@ -116,11 +112,16 @@ async def create_realm(keycloak_url: str, token: str, realm_name: str) -> bool:
 
 
 async def create_client(
-    keycloak_url: str, token: str, realm_name: str, client_id: str
+    client: httpx.AsyncClient,
+    keycloak_url: str,
+    token: str,
+    realm_name: str,
+    client_id: str,
 ) -> tuple[bool, str | None]:
     """Create client in Keycloak.
     
     Args:
+        client: Shared HTTP client
         keycloak_url: Keycloak server URL
         token: Admin access token
         realm_name: Realm name
@@ -130,8 +131,30 @@ async def create_client(
         Tuple of (success, client_secret)
     """
     try:
-        async with httpx.AsyncClient() as client:
-            # Check if client exists
+        # Create client (409 means it already exists)
+        create_response = await client.post(
+            f"{keycloak_url}/admin/realms/{realm_name}/clients",
+            headers={
+                "Authorization": f"Bearer {token}",
+                "Content-Type": "application/json",
+            },
+            json={
+                "clientId": client_id,
+                "enabled": True,
+                "publicClient": False,
+                "serviceAccountsEnabled": True,
+                "directAccessGrantsEnabled": True,
+                "standardFlowEnabled": True,
+            },
+        )
+
+        if create_response.status_code in [201, 409]:
+            if create_response.status_code == 201:
+                logger.info(f"✅ Client '{client_id}' created")
+            else:
+                logger.info(f"✅ Client '{client_id}' already exists")
+
+            # The secret endpoint needs the client UUID
             clients_response = await client.get(
                 f"{keycloak_url}/admin/realms/{realm_name}/clients",
                 headers={"Authorization": f"Bearer {token}"},
@@ -139,68 +162,26 @@ async def create_client(
             )
 
             if clients_response.status_code == 200:
-                existing_clients = clients_response.json()
-                if existing_clients:
-                    logger.info(f"✅ Client '{client_id}' already exists")
-                    # Get secret
-                    client_uuid = existing_clients[0]["id"]
+                clients = orjson.loads(clients_response.content)
+                if clients:
+                    client_uuid = clients[0]["id"]
+
+                    # Get client secret
                     secret_response = await client.get(
                         f"{keycloak_url}/admin/realms/{realm_name}/clients/{client_uuid}/client-secret",
                         headers={"Authorization": f"Bearer {token}"},
                     )
+
                     if secret_response.status_code == 200:
-                        secret = secret_response.json().get("value")
+                        secret = orjson.loads(secret_response.content).get("value")
+                        logger.info(f"   Client secret: {secret}")
                         return True, secret
-                    return True, None
 
-            # Create client
-            create_response = await client.post(
-                f"{keycloak_url}/admin/realms/{realm_name}/clients",
-                headers={
-                    "Authorization": f"Bearer {token}",
-                    "Content-Type": "application/json",
-                },
-                json={
-                    "clientId": client_id,
-                    "enabled": True,
-                    "publicClient": False,
-                    "serviceAccountsEnabled": True,
-                    "directAccessGrantsEnabled": True,
-                    "standardFlowEnabled": True,
-                },
-            )
-
-            if create_response.status_code == 201:
-                logger.info(f"✅ Client '{client_id}' created")
-
-                # Get client UUID from location header or fetch
-                clients_response = await client.get(
-                    f"{keycloak_url}/admin/realms/{realm_name}/clients",
-                    headers={"Authorization": f"Bearer {token}"},
-                    params={"clientId": client_id},
-                )
-
-                if clients_response.status_code == 200:
-                    clients = clients_response.json()
-                    if clients:
-                        client_uuid = clients[0]["id"]
-
-                        # Get client secret
-                        secret_response = await client.get(
-                            f"{keycloak_url}/admin/realms/{realm_name}/clients/{client_uuid}/client-secret",
-                            headers={"Authorization": f"Bearer {token}"},
-                        )
-
-                        if secret_response.status_code == 200:
-                            secret = secret_response.json().get("value")
-                            logger.info(f"   Client secret: {secret}")
-                            return True, secret
-
-                return True, None
-            else:
-                logger.error(f"Failed to create client: {create_response.status_code}")
-                logger.error(f"Response: {create_response.text}")
-                return False, None
+            return True, None
+        else:
+            logger.error(f"Failed to create client: {create_response.status_code}")
+            logger.error(f"Response: {create_response.text}")
+            return False, None
 
     except Exception as e:
         logger.error(f"Failed to create client: {e}")
@@ -208,6 +189,7 @@ async def create_client(
 
 
 async def create_user(
+    client: httpx.AsyncClient,
     keycloak_url: str,
     token: str,
     realm_name: str,
@@ -217,6 +199,7 @@ async def create_user(
     """Create user in Keycloak with attributes.
     
     Args:
+        client: Shared HTTP client
         keycloak_url: Keycloak server URL
         token: Admin access token
         realm_name: Realm name
@@ -227,58 +210,47 @@ async def create_user(
         True if successful
     """
     try:
-        async with httpx.AsyncClient() as client:
-            # Check if user exists
-            users_response = await client.get(
-                f"{keycloak_url}/admin/realms/{realm_name}/users",
-                headers={"Authorization": f"Bearer {token}"},
-                params={"username": username},
-            )
-
-            if users_response.status_code == 200:
-                existing_users = users_response.json()
-                if existing_users:
-                    logger.info(f"✅ User '{username}' already exists")
-                    return True
-
-            # Create user
-            create_response = await client.post(
-                f"{keycloak_url}/admin/realms/{realm_name}/users",
-                headers={
-                    "Authorization": f"Bearer {token}",
-                    "Content-Type": "application/json",
-                },
-                json={
-                    "username": username,
-                    "enabled": True,
-                    "emailVerified": True,
-                    "firstName": "Test",
-                    "lastName": "User",
-                    "email": f"{username}@example.com",
-                    "attributes": {
-                        "user_plan": ["pro"],
-                        "max_tool_calls_per_request": ["50"],
-                        "max_model_calls_per_request": ["30"],
-                        "mcp_tools_enabled": ["true"],
-                    },
-                    "credentials": [
-                        {
-                            "type": "password",
-                            "value": password,
-                            "temporary": False,
-                        }
-                    ],
+        # Create user (409 means it already exists)
+        create_response = await client.post(
+            f"{keycloak_url}/admin/realms/{realm_name}/users",
+            headers={
+                "Authorization": f"Bearer {token}",
+                "Content-Type": "application/json",
+            },
+            json={
+                "username": username,
+                "enabled": True,
+                "emailVerified": True,
+                "firstName": "Test",
+                "lastName": "User",
+                "email": f"{username}@example.com",
+                "attributes": {
+                    "user_plan": ["pro"],
+                    "max_tool_calls_per_request": ["50"],
+                    "max_model_calls_per_request": ["30"],
+                    "mcp_tools_enabled": ["true"],
                 },
-            )
-
-            if create_response.status_code in [201, 409]:
-                logger.info(f"✅ User '{username}' created with password '{password}'")
-                logger.info(f"   Attributes: Pro plan, 50 tool calls, 30 model calls")
-                return True
-            else:
-                logger.error(f"Failed to create user: {create_response.status_code}")
-                logger.error(f"Response: {create_response.text}")
-                return False
+                "credentials": [
+                    {
+                        "type": "password",
+                        "value": password,
+                        "temporary": False,
+                    }
+                ],
+            },
+        )
+
+        if create_response.status_code == 409:
+            logger.info(f"✅ User '{username}' already exists")
+            return True
+        elif create_response.status_code == 201:
+            logger.info(f"✅ User '{username}' created with password '{password}'")
+            logger.info(f"   Attributes: Pro plan, 50 tool calls, 30 model calls")
+            return True
+        else:
+            logger.error(f"Failed to create user: {create_response.status_code}")
+            logger.error(f"Response: {create_response.text}")
+            return False
 
     except Exception as e:
         logger.error(f"Failed to create user: {e}")
@@ -300,39 +272,38 @@ async def main():
     logger.info(f"Client ID: {client_id}")
     logger.info(f"Test user: {test_username}\n")
 
-    # Step 1: Get admin token
-    logger.info("Step 1: Getting admin token...")
-    token = await get_admin_token(keycloak_url)
-    if not token:
-        logger.error("❌ Failed to get admin token")
-        logger.info("   Make sure Keycloak is running:")
-        logger.info("   docker compose -f docker-compose.keycloak.yml up -d")
-        return 1
-
-    logger.info("✅ Got admin token\n")
-
-    # Step 2: Create realm
-    logger.info(f"Step 2: Creating realm '{realm_name}'...")
-    if not await create_realm(keycloak_url, token, realm_name):
-        return 1
-    logger.info("")
-
-    # Step 3: Create client
-    logger.info(f"Step 3: Creating client '{client_id}'...")
-    success, client_secret = await create_client(
-        keycloak_url, token, realm_name, client_id
-    )
-    if not success:
-        return 1
-    logger.info("")
-
-    # Step 4: Create user
-    logger.info(f"Step 4: Creating user '{test_username}'...")
-    if not await create_user(
-        keycloak_url, token, realm_name, test_username, test_password
-    ):
-        return 1
-    logger.info("")
+    # One client for every step so the connection to Keycloak is reused
+    async with httpx.AsyncClient(timeout=10.0) as client:
+        # Step 1: Get admin token
+        logger.info("Step 1: Getting admin token...")
+        token = await get_admin_token(client, keycloak_url)
+        if not token:
+            logger.error("❌ Failed to get admin token")
+            logger.info("   Make sure Keycloak is running:")
+            logger.info("   docker compose -f docker-compose.keycloak.yml up -d")
+            return 1
+
+        logger.info("✅ Got admin token\n")
+
+        # Step 2: Create realm
+        logger.info(f"Step 2: Creating realm '{realm_name}'...")
+        if not await create_realm(client, keycloak_url, token, realm_name):
+            return 1
+        logger.info("")
+
+        # Step 3: Create client and user (both only depend on the realm)
+        logger.info(
+            f"Step 3: Creating client '{client_id}' and user '{test_username}'..."
+        )
+        (success, client_secret), user_created = await asyncio.gather(
+            create_client(client, keycloak_url, token, realm_name, client_id),
+            create_user(
+                client, keycloak_url, token, realm_name, test_username, test_password
+            ),
+        )
+        if not success or not user_created:
+            return 1
+        logger.info("")
 
     # Summary
     logger.info("=" * 60)
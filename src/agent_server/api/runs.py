@@ -11,7 +11,8 @@ import structlog
 from fastapi import APIRouter, Depends, Header, HTTPException, Query
 from fastapi.responses import StreamingResponse
 from langgraph.types import Command, Send
-from sqlalchemy import delete, select, update
+from sqlalchemy import cast, delete, func, select, update
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..core.auth_ctx import with_auth_ctx
@@ -42,6 +43,22 @@ serializer = GeneralSerializer()
 # All run metadata/state is persisted via ORM.
 active_runs: dict[str, asyncio.Task] = {}
 
+
+def _track_run_task(run_id: str, task: asyncio.Task) -> None:
+    """Register a background run task until it finishes.
+
+    The entry is dropped by a done callback, which also fires for tasks
+    cancelled before they ever started running.
+    """
+    active_runs[run_id] = task
+
+    def _untrack(done: asyncio.Task) -> None:
+        if active_runs.get(run_id) is done:
+            del active_runs[run_id]
+
+    task.add_done_callback(_untrack)
+
+
 # Default stream modes for background run execution
 DEFAULT_STREAM_MODES = ["values"]
 
@@ -85,7 +102,7 @@ async def set_thread_status(session: AsyncSession, thread_id: str, status: str)
     result = await session.execute(
         update(ThreadORM)
         .where(ThreadORM.thread_id == thread_id)
-        .values(status=validated_status, updated_at=datetime.now(UTC))
+        .values(status=validated_status, updated_at=func.now())
     )
     await session.commit()
 
@@ -101,16 +118,27 @@ async def update_thread_metadata(
     graph_id: str,
     user_id: str | None = None,
 ) -> None:
-    """Update thread metadata with assistant and graph information (dialect agnostic).
+    """Update thread metadata with assistant and graph information.
 
     If thread doesn't exist, auto-creates it.
     """
-    # Read-modify-write to avoid DB-specific JSON concat operators
-    thread = await session.scalar(
-        select(ThreadORM).where(ThreadORM.thread_id == thread_id)
+    # Merge in a single UPDATE with JSONB concatenation so concurrent
+    # metadata writers cannot lose each other's keys
+    patch = {
+        "assistant_id": str(assistant_id),
+        "graph_id": graph_id,
+    }
+    current = func.coalesce(ThreadORM.metadata_json, cast({}, JSONB))
+    result = await session.execute(
+        update(ThreadORM)
+        .where(ThreadORM.thread_id == thread_id)
+        .values(
+            metadata_json=current.op("||")(cast(patch, JSONB)),
+            updated_at=func.now(),
+        )
     )
 
-    if not thread:
+    if result.rowcount == 0:
         # Auto-create thread if it doesn't exist
         if not user_id:
             raise HTTPException(400, "Cannot auto-create thread: user_id is required")
@@ -129,21 +157,7 @@ async def update_thread_metadata(
             user_id=user_id,
         )
         session.add(thread_orm)
-        await session.commit()
-        return
 
-    md = dict(getattr(thread, "metadata_json", {}) or {})
-    md.update(
-        {
-            "assistant_id": str(assistant_id),
-            "graph_id": graph_id,
-        }
-    )
-    await session.execute(
-        update(ThreadORM)
-        .where(ThreadORM.thread_id == thread_id)
-        .values(metadata_json=md, updated_at=datetime.now(UTC))
-    )
     await session.commit()
 
 
@@ -292,7 +306,7 @@ async def create_run(
     logger.info(
         f"[create_run] background task created task_id={id(task)} for run_id={run_id}"
     )
-    active_runs[run_id] = task
+    _track_run_task(run_id, task)
 
     return run
 
@@ -423,7 +437,7 @@ async def create_and_stream_run(
     logger.info(
         f"[create_and_stream_run] background task created task_id={id(task)} for run_id={run_id}"
     )
-    active_runs[run_id] = task
+    _track_run_task(run_id, task)
 
     # Extract requested stream mode(s)
     stream_mode = request.stream_mode
@@ -468,9 +482,6 @@ async def get_run(
     if not run_orm:
         raise HTTPException(404, f"Run '{run_id}' not found")
 
-    # Refresh to ensure we have the latest data (in case background task updated it)
-    await session.refresh(run_orm)
-
     logger.info(
         f"[get_run] found run status={run_orm.status} user={user.identity} thread_id={thread_id} run_id={run_id}"
     )
@@ -547,19 +558,10 @@ async def update_run(
         # Handle interruption - use interrupt_run for cooperative interruption
         await streaming_service.interrupt_run(run_id)
         logger.info(f"[update_run] set DB status=interrupted run_id={run_id}")
-        await session.execute(
-            update(RunORM)
-            .where(RunORM.run_id == str(run_id))
-            .values(status="interrupted", updated_at=datetime.now(UTC))
-        )
+        run_orm = await _set_run_interrupted(session, run_id)
         await session.commit()
         logger.info(f"[update_run] commit done (interrupted) run_id={run_id}")
 
-    # Return final run state
-    run_orm = await session.scalar(select(RunORM).where(RunORM.run_id == run_id))
-    if run_orm:
-        # Refresh to ensure we have the latest data after our own update
-        await session.refresh(run_orm)
     return Run.model_validate(
         {c.name: getattr(run_orm, c.name) for c in run_orm.__table__.columns}
     )
@@ -588,8 +590,6 @@ async def join_run(
     # Check if run is in a terminal state
     terminal_states = ["success", "error", "interrupted"]
     if run_orm.status in terminal_states:
-        # Refresh to ensure we have the latest data
-        await session.refresh(run_orm)
         output = getattr(run_orm, "output", None) or {}
         return output
 
@@ -605,10 +605,12 @@ async def join_run(
             # Task was cancelled, that's also okay
             pass
 
-    # Return final output from database
-    run_orm = await session.scalar(select(RunORM).where(RunORM.run_id == run_id))
-    if run_orm:
-        await session.refresh(run_orm)  # Refresh to get latest data from DB
+    # Return final output from database, replacing the stale loaded instance
+    run_orm = await session.scalar(
+        select(RunORM)
+        .where(RunORM.run_id == run_id)
+        .execution_options(populate_existing=True)
+    )
     output = getattr(run_orm, "output", None) or {}
     return output
 
@@ -725,7 +727,7 @@ async def wait_for_run(
     logger.info(
         f"[wait_for_run] background task created task_id={id(task)} for run_id={run_id}"
     )
-    active_runs[run_id] = task
+    _track_run_task(run_id, task)
 
     # Wait for task to complete with timeout
     try:
@@ -740,19 +742,19 @@ async def wait_for_run(
         logger.error(f"[wait_for_run] exception in run_id={run_id}: {e}")
         # Exception already handled by execute_run_async
 
-    # Get final output from database
+    # Get final output from database, replacing any stale loaded instance
     run_orm = await session.scalar(
-        select(RunORM).where(
+        select(RunORM)
+        .where(
             RunORM.run_id == run_id,
             RunORM.thread_id == thread_id,
             RunORM.user_id == user.identity,
         )
+        .execution_options(populate_existing=True)
     )
     if not run_orm:
         raise HTTPException(500, f"Run '{run_id}' disappeared during execution")
 
-    await session.refresh(run_orm)
-
     # Return output based on final status
     if run_orm.status == "success":
         return run_orm.output or {}
@@ -878,41 +880,32 @@ async def cancel_run_endpoint(
             f"[cancel_run] interrupt run_id={run_id} user={user.identity} thread_id={thread_id}"
         )
         await streaming_service.interrupt_run(run_id)
-        # Persist status as interrupted
-        await session.execute(
-            update(RunORM)
-            .where(RunORM.run_id == str(run_id))
-            .values(status="interrupted", updated_at=datetime.now(UTC))
-        )
-        await session.commit()
     else:
         logger.info(
             f"[cancel_run] cancel run_id={run_id} user={user.identity} thread_id={thread_id}"
         )
         await streaming_service.cancel_run(run_id)
-        # Persist status as interrupted
-        await session.execute(
-            update(RunORM)
-            .where(RunORM.run_id == str(run_id))
-            .values(status="interrupted", updated_at=datetime.now(UTC))
-        )
-        await session.commit()
 
-    # Optionally wait for background task
+    # Persist status as interrupted
+    run_orm = await _set_run_interrupted(session, run_id)
+    await session.commit()
+
+    # Optionally wait for background task, then reload the state it settled on
+    # (do NOT delete here; deletion is a separate endpoint)
     if wait:
         task = active_runs.get(run_id)
         if task:
             with contextlib.suppress(asyncio.CancelledError, Exception):
                 await task
-
-    # Reload and return updated Run (do NOT delete here; deletion is a separate endpoint)
-    run_orm = await session.scalar(
-        select(RunORM).where(
-            RunORM.run_id == run_id,
-            RunORM.thread_id == thread_id,
-            RunORM.user_id == user.identity,
-        )
-    )
+            run_orm = await session.scalar(
+                select(RunORM)
+                .where(
+                    RunORM.run_id == run_id,
+                    RunORM.thread_id == thread_id,
+                    RunORM.user_id == user.identity,
+                )
+                .execution_options(populate_existing=True)
+            )
     if not run_orm:
         raise HTTPException(404, f"Run '{run_id}' not found after cancellation")
     return Run.model_validate(
@@ -1077,7 +1070,21 @@ async def execute_run_async(
     finally:
         # Clean up broker
         await streaming_service.cleanup_run(run_id)
-        active_runs.pop(run_id, None)
+
+
+async def _set_run_interrupted(session: AsyncSession, run_id: str) -> RunORM | None:
+    """Mark a run interrupted and return the updated row in the same round trip.
+
+    populate_existing overwrites any instance of the run already loaded in the
+    session, so no follow-up SELECT is needed. The caller commits.
+    """
+    return await session.scalar(
+        update(RunORM)
+        .where(RunORM.run_id == str(run_id))
+        .values(status="interrupted", updated_at=func.now())
+        .returning(RunORM)
+        .execution_options(populate_existing=True)
+    )
 
 
 async def update_run_status(
@@ -1100,14 +1107,15 @@ async def update_run_status(
         session = maker()  # type: ignore[assignment]
         owns_session = True
     try:
-        values = {"status": validated_status, "updated_at": datetime.now(UTC)}
+        values: dict[str, Any] = {"status": validated_status, "updated_at": func.now()}
         if output is not None:
             # Serialize output to ensure JSON compatibility
             try:
-                serialized_output = serializer.serialize(output)
-                values["output"] = serialized_output
+                values["output"] = serializer.serialize(output)
             except Exception as e:
-                logger.warning(f"Failed to serialize output for run {run_id}: {e}")
+                logger.warning(
+                    "Failed to serialize run output", run_id=run_id, error=str(e)
+                )
                 values["output"] = {
                     "error": "Output serialization failed",
                     "original_type": str(type(output)),
@@ -1115,13 +1123,13 @@ async def update_run_status(
         if error is not None:
             values["error_message"] = error
         logger.info(
-            f"[update_run_status] updating DB run_id={run_id} status={validated_status}"
+            "[update_run_status] updating DB", run_id=run_id, status=validated_status
         )
         await session.execute(
             update(RunORM).where(RunORM.run_id == str(run_id)).values(**values)
         )  # type: ignore[arg-type]
         await session.commit()
-        logger.info(f"[update_run_status] commit done run_id={run_id}")
+        logger.info("[update_run_status] commit done", run_id=run_id)
     finally:
         # Close only if we created it here
         if owns_session:
@@ -3,3 +3,7 @@ from uuid import UUID
 # Standard namespace UUID for deriving deterministic assistant IDs from graph IDs.
 # IMPORTANT: Do not change after initial deploy unless you plan a data migration.
 ASSISTANT_NAMESPACE_UUID = UUID("6ba7b821-9dad-11d1-80b4-00c04fd430c8")
+
+# Paths served without authentication (health probes only).
+# A frozenset keeps the per-request membership check O(1).
+PUBLIC_ENDPOINTS = frozenset({"/health", "/ready", "/live"})
@@ -23,6 +23,7 @@ from starlette.authentication import (
 from starlette.requests import HTTPConnection
 from starlette.responses import JSONResponse
 
+from ..constants import PUBLIC_ENDPOINTS
 from ..models.errors import AgentProtocolError
 
 logger = structlog.getLogger(__name__)
@@ -118,6 +119,9 @@ class LangGraphAuthBackend(AuthenticationBackend):
         Raises:
             AuthenticationError: If authentication fails
         """
+        if conn.url.path in PUBLIC_ENDPOINTS:
+            return None
+
         if self.auth_instance is None:
             logger.warning("No auth instance available, skipping authentication")
             return None
@@ -157,15 +161,17 @@ class LangGraphAuthBackend(AuthenticationBackend):
             credentials = AuthCredentials(permissions)
             user = LangGraphUser(user_data)
 
-            logger.debug(f"Successfully authenticated user: {user.identity}")
+            logger.debug("Successfully authenticated user", user_id=user.identity)
             return credentials, user
 
         except Auth.exceptions.HTTPException as e:
-            logger.warning(f"Authentication failed: {e.detail}")
+            logger.warning("Authentication failed", detail=e.detail)
             raise AuthenticationError(e.detail) from e
 
         except Exception as e:
-            logger.error(f"Unexpected error during authentication: {e}", exc_info=True)
+            logger.error(
+                "Unexpected error during authentication", error=str(e), exc_info=True
+            )
             raise AuthenticationError("Authentication system error") from e
 
 
@@ -197,7 +203,7 @@ def on_auth_error(conn: HTTPConnection, exc: AuthenticationError) -> JSONRespons
     Returns:
         JSON response with Agent Protocol error format
     """
-    logger.warning(f"Authentication error for {conn.url}: {exc}")
+    logger.warning("Authentication error", url=str(conn.url), error=str(exc))
 
     return JSONResponse(
         status_code=401,
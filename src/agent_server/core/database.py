@@ -3,6 +3,7 @@
 import os
 from typing import Any
 
+import orjson
 import structlog
 from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
 from langgraph.store.postgres.aio import AsyncPostgresStore
@@ -11,6 +12,11 @@ from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 logger = structlog.get_logger(__name__)
 
 
+def _json_serializer(obj: Any) -> str:
+    """Encode JSON/JSONB column values with orjson (stdlib-compatible keys)"""
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
 class DatabaseManager:
     """Manages database connections and LangGraph persistence components"""
 
@@ -30,6 +36,8 @@ class DatabaseManager:
         self.engine = create_async_engine(
             self._database_url,
             echo=os.getenv("DATABASE_ECHO", "false").lower() == "true",
+            json_serializer=_json_serializer,
+            json_deserializer=orjson.loads,
         )
 
         # Convert asyncpg URL to psycopg format for LangGraph
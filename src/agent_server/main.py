@@ -28,6 +28,7 @@ from fastapi.responses import JSONResponse
 from starlette.middleware.authentication import AuthenticationMiddleware
 
 from .api.assistants import router as assistants_router
+from .api.runs import active_runs
 from .api.runs import router as runs_router
 from .api.store import router as store_router
 from .api.threads import router as threads_router
@@ -38,13 +39,14 @@ from .middleware import DoubleEncodedJSONMiddleware, StructLogMiddleware
 from .models.errors import AgentProtocolError, get_error_type
 from .observability.base import get_observability_manager
 from .observability.langfuse_integration import _langfuse_provider
+from .security.keycloak_client import (
+    close_keycloak_client,
+    prewarm_keycloak_client,
+)
 from .services.event_store import event_store
 from .services.langgraph_service import get_langgraph_service
 from .utils.setup_logging import setup_logging
 
-# Task management for run cancellation
-active_runs: dict[str, asyncio.Task] = {}
-
 setup_logging()
 logger = structlog.getLogger(__name__)
 
@@ -66,16 +68,27 @@ async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
     # Initialize event store cleanup task
     await event_store.start_cleanup_task()
 
+    # Warm up the Keycloak connection pool so the first request skips the handshake
+    keycloak_auth = os.getenv("AUTH_TYPE", "noop").lower() == "keycloak"
+    if keycloak_auth:
+        await prewarm_keycloak_client()
+
     yield
 
-    # Shutdown: Clean up connections and cancel active runs
-    for task in active_runs.values():
-        if not task.done():
-            task.cancel()
+    # Shutdown: Clean up connections and cancel active runs. Runs remove
+    # themselves from active_runs as they finish, so work on a snapshot.
+    pending_runs = [task for task in list(active_runs.values()) if not task.done()]
+    for task in pending_runs:
+        task.cancel()
+    if pending_runs:
+        await asyncio.gather(*pending_runs, return_exceptions=True)
 
     # Stop event store cleanup task
     await event_store.stop_cleanup_task()
 
+    if keycloak_auth:
+        await close_keycloak_client()
+
     await db_manager.close()
 
 
@@ -13,17 +13,19 @@ class AgentProtocolError(BaseModel):
     details: dict[str, Any] | None = Field(None, description="Additional error details")
 
 
+_ERROR_TYPES: dict[int, str] = {
+    400: "bad_request",
+    401: "unauthorized",
+    403: "forbidden",
+    404: "not_found",
+    409: "conflict",
+    422: "validation_error",
+    500: "internal_error",
+    501: "not_implemented",
+    503: "service_unavailable",
+}
+
+
 def get_error_type(status_code: int) -> str:
     """Map HTTP status codes to error types"""
-    error_map = {
-        400: "bad_request",
-        401: "unauthorized",
-        403: "forbidden",
-        404: "not_found",
-        409: "conflict",
-        422: "validation_error",
-        500: "internal_error",
-        501: "not_implemented",
-        503: "service_unavailable",
-    }
-    return error_map.get(status_code, "unknown_error")
+    return _ERROR_TYPES.get(status_code, "unknown_error")
@@ -1,7 +1,7 @@
 """Run-related Pydantic models for Agent Protocol"""
 
 from datetime import datetime
-from typing import Any, Self
+from typing import Any
 
 from pydantic import (
     BaseModel,
@@ -67,21 +67,30 @@ class RunCreate(BaseModel):
         description="Request metadata (e.g., from_studio flag)",
     )
 
-    @model_validator(mode="after")
-    def validate_input_command_exclusivity(self) -> Self:
-        """Ensure input and command are mutually exclusive"""
+    @model_validator(mode="before")
+    @classmethod
+    def validate_input_command_exclusivity(cls, data: Any) -> Any:
+        """Ensure input and command are mutually exclusive
+
+        Runs on the raw payload so invalid requests are rejected before any
+        field is validated.
+        """
+        if not isinstance(data, dict):
+            return data
+        input_ = data.get("input")
+        command = data.get("command")
         # Allow empty input dict when command is present (frontend compatibility)
-        if self.input is not None and self.command is not None:
+        if input_ is not None and command is not None:
             # If input is just an empty dict, treat it as None for compatibility
-            if self.input == {}:
-                self.input = None
+            if input_ == {}:
+                data = {**data, "input": None}
             else:
                 raise ValueError(
                     "Cannot specify both 'input' and 'command' - they are mutually exclusive"
                 )
-        if self.input is None and self.command is None:
+        elif input_ is None and command is None:
             raise ValueError("Must specify either 'input' or 'command'")
-        return self
+        return data
 
 
 class Run(BaseModel):
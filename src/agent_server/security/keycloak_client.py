@@ -1,11 +1,16 @@
 """Keycloak JWT validation and user info extraction.
 
 This module provides integration with Keycloak for authentication.
-It validates JWT tokens via Keycloak's userinfo endpoint and extracts
-user claims including custom attributes like plan tier and quotas.
+It verifies JWT signatures locally against the realm's cached JWKS
+(falling back to Keycloak's userinfo endpoint) and extracts user claims
+including custom attributes like plan tier and quotas.
 """
 
+import asyncio
+import hashlib
 import os
+import time
+from collections import OrderedDict
 from typing import Any
 
 import httpx
@@ -20,13 +25,137 @@ KEYCLOAK_REALM = os.getenv("KEYCLOAK_REALM", "langgraph-app")
 KEYCLOAK_CLIENT_ID = os.getenv("KEYCLOAK_CLIENT_ID", "langgraph-client")
 KEYCLOAK_CLIENT_SECRET = os.getenv("KEYCLOAK_CLIENT_SECRET", "")
 
+# Shared HTTP client so token validation reuses pooled connections to Keycloak
+_HTTP_LIMITS = httpx.Limits(
+    max_connections=200, max_keepalive_connections=100, keepalive_expiry=30
+)
+_http_client: httpx.AsyncClient | None = None
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    """Return the shared Keycloak HTTP client, creating it on first use."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(timeout=10.0, limits=_HTTP_LIMITS)
+    return _http_client
+
+
+async def prewarm_keycloak_client() -> None:
+    """Fetch the realm's signing keys before the first request arrives.
+
+    This also opens a pooled connection to Keycloak, so neither the JWKS
+    download nor the TCP/TLS handshake lands on an authenticated request.
+    Failures are logged and otherwise ignored.
+    """
+    async with _jwks_lock:
+        await _refresh_jwks()
+
+
+async def close_keycloak_client() -> None:
+    """Close the shared Keycloak HTTP client."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+# Realm signing keys by ``kid``. Refreshed when a token names an unknown key,
+# at most once per _JWKS_MIN_REFRESH_INTERVAL seconds.
+_JWKS_MIN_REFRESH_INTERVAL = 30.0
+_jwks: dict[str, jwt.PyJWK] = {}
+_jwks_fetched_at = 0.0
+_jwks_lock = asyncio.Lock()
+
+
+async def _refresh_jwks() -> None:
+    """Reload the realm's JWKS. Callers must hold _jwks_lock."""
+    global _jwks, _jwks_fetched_at
+    certs_url = (
+        f"{KEYCLOAK_SERVER_URL}/realms/{KEYCLOAK_REALM}/protocol/openid-connect/certs"
+    )
+    _jwks_fetched_at = time.monotonic()
+    try:
+        response = await _get_http_client().get(certs_url)
+        response.raise_for_status()
+        jwk_set = jwt.PyJWKSet.from_dict(response.json())
+    except (httpx.HTTPError, jwt.PyJWKSetError, ValueError, AttributeError) as e:
+        # ValueError/AttributeError: a body that is not JSON or not an object,
+        # e.g. an error page served by a proxy with status 200
+        logger.warning("Failed to fetch Keycloak JWKS", error=str(e))
+        return
+
+    _jwks = {key.key_id: key for key in jwk_set.keys if key.key_id}
+    logger.info("Keycloak JWKS loaded", key_count=len(_jwks))
+
+
+async def _get_signing_key(kid: str) -> jwt.PyJWK | None:
+    """Return the signing key for ``kid``, refetching the JWKS on a miss."""
+    key = _jwks.get(kid)
+    if key is not None:
+        return key
+
+    async with _jwks_lock:
+        key = _jwks.get(kid)
+        if key is None and (
+            time.monotonic() - _jwks_fetched_at >= _JWKS_MIN_REFRESH_INTERVAL
+        ):
+            await _refresh_jwks()
+            key = _jwks.get(kid)
+    return key
+
+
+# Validated claims keyed by token hash, so repeat requests skip the userinfo
+# round trip. Entries never outlive the token's ``exp``.
+_CLAIMS_CACHE_MAX_TTL = 300.0
+_CLAIMS_CACHE_MAX_SIZE = 10_000
+_claims_cache: OrderedDict[bytes, tuple[float, dict[str, Any]]] = OrderedDict()
+
+
+# Shared decoder; decode_complete returns header and payload from one parse
+_pyjwt = jwt.PyJWT()
+
+# Validations in progress keyed by token hash (see validate_keycloak_token)
+_inflight_validations: dict[bytes, asyncio.Future[dict[str, Any]]] = {}
+
+
+def _claims_cache_key(token: str) -> bytes:
+    """Hash the raw token so cache keys never hold credentials."""
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
+def _get_cached_claims(key: bytes) -> dict[str, Any] | None:
+    """Return unexpired cached claims for a token hash, if any."""
+    cached = _claims_cache.get(key)
+    if cached is None:
+        return None
+    if cached[0] <= time.monotonic():
+        del _claims_cache[key]
+        return None
+    _claims_cache.move_to_end(key)
+    return cached[1]
+
+
+def _cache_claims(key: bytes, exp: Any, claims: dict[str, Any]) -> None:
+    """Cache validated claims until shortly before the token expires."""
+    if not isinstance(exp, int | float) or not exp:
+        return
+
+    ttl = min(exp - time.time() - 5, _CLAIMS_CACHE_MAX_TTL)
+    if ttl <= 0:
+        return
+
+    _claims_cache[key] = (time.monotonic() + ttl, claims)
+    _claims_cache.move_to_end(key)
+    while len(_claims_cache) > _CLAIMS_CACHE_MAX_SIZE:
+        _claims_cache.popitem(last=False)
+
 
 async def validate_keycloak_token(token: str) -> dict[str, Any]:
-    """Validate JWT token with Keycloak userinfo endpoint.
+    """Validate JWT token against Keycloak.
 
-    This function attempts to validate the token by calling Keycloak's
-    userinfo endpoint. If that fails, it falls back to decoding the JWT
-    locally (without signature verification for development).
+    The signature is verified locally with the realm's JWKS. If no signing
+    key is available, this falls back to Keycloak's userinfo endpoint and
+    finally to decoding the JWT without verification (development only).
 
     Args:
         token: JWT access token (without "Bearer " prefix)
@@ -44,6 +173,67 @@ async def validate_keycloak_token(token: str) -> dict[str, Any]:
     Raises:
         ValueError: If token is invalid or cannot be validated
     """
+    key = _claims_cache_key(token)
+    claims = _get_cached_claims(key)
+    if claims is not None:
+        return claims
+
+    # Concurrent requests with the same token share one validation
+    inflight = _inflight_validations.get(key)
+    if inflight is None:
+        inflight = asyncio.ensure_future(_validate_and_cache(key, token))
+        _inflight_validations[key] = inflight
+        inflight.add_done_callback(lambda _: _inflight_validations.pop(key, None))
+    # Shield so one cancelled request does not cancel the others' validation
+    return await asyncio.shield(inflight)
+
+
+async def _validate_and_cache(key: bytes, token: str) -> dict[str, Any]:
+    """Resolve user claims for a token and cache the result."""
+    # Parse header and payload once; the key id, expiry and fallback claims
+    # are all read from this result
+    try:
+        unverified = _pyjwt.decode_complete(
+            token, options={"verify_signature": False}, algorithms=["RS256"]
+        )
+    except jwt.InvalidTokenError as e:
+        logger.error("Invalid JWT token", error=str(e))
+        raise ValueError(f"Invalid JWT token: {e}") from e
+
+    claims = await _fetch_user_claims(token, unverified)
+    _cache_claims(key, unverified["payload"].get("exp"), claims)
+    return claims
+
+
+async def _fetch_user_claims(token: str, unverified: dict[str, Any]) -> dict[str, Any]:
+    """Resolve user claims for a token without consulting the cache.
+
+    ``unverified`` is the token's decoded header and payload, as returned by
+    ``PyJWT.decode_complete`` without signature verification.
+    """
+    kid = unverified["header"].get("kid")
+    signing_key = await _get_signing_key(kid) if kid else None
+    if signing_key is not None:
+        try:
+            # Keycloak access tokens carry "account" rather than the client
+            # id as audience unless an audience mapper is configured
+            decoded = jwt.decode(
+                token,
+                key=signing_key.key,
+                algorithms=["RS256"],
+                options={"verify_aud": False},
+            )
+        except jwt.InvalidTokenError as e:
+            logger.warning("JWT signature verification failed", error=str(e))
+            raise ValueError(f"Invalid JWT token: {e}") from e
+
+        return _extract_user_claims(decoded)
+
+    if _jwks:
+        # Keys are available but none matches: the token was not issued here
+        logger.warning("JWT signed with unknown key", kid=kid)
+        raise ValueError("Invalid JWT token: unknown signing key")
+
     # Construct Keycloak userinfo endpoint URL
     userinfo_url = (
         f"{KEYCLOAK_SERVER_URL}/realms/{KEYCLOAK_REALM}/protocol/openid-connect/userinfo"
@@ -51,25 +241,23 @@ async def validate_keycloak_token(token: str) -> dict[str, Any]:
 
     try:
         # Try to validate via Keycloak userinfo endpoint
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                userinfo_url,
-                headers={"Authorization": f"Bearer {token}"},
-                timeout=10.0,
-            )
+        response = await _get_http_client().get(
+            userinfo_url,
+            headers={"Authorization": f"Bearer {token}"},
+        )
 
-            if response.status_code == 200:
-                user_info = response.json()
-                logger.info(
-                    "Token validated via Keycloak userinfo",
-                    user_id=user_info.get("sub"),
-                )
-                return _extract_user_claims(user_info)
-
-            logger.warning(
-                "Keycloak userinfo endpoint returned error",
-                status_code=response.status_code,
+        if response.status_code == 200:
+            user_info = response.json()
+            logger.info(
+                "Token validated via Keycloak userinfo",
+                user_id=user_info.get("sub"),
             )
+            return _extract_user_claims(user_info)
+
+        logger.warning(
+            "Keycloak userinfo endpoint returned error",
+            status_code=response.status_code,
+        )
 
     except httpx.RequestError as e:
         logger.warning(
@@ -77,26 +265,33 @@ async def validate_keycloak_token(token: str) -> dict[str, Any]:
             error=str(e),
         )
 
-    # Fallback: Decode JWT locally (without verification for development)
-    # In production, you should verify the signature using Keycloak's public key
-    try:
-        # Decode without verification (for development only)
-        # TODO: In production, fetch and use Keycloak's public key for verification
-        decoded = jwt.decode(
-            token,
-            options={"verify_signature": False},  # Development only!
-            algorithms=["RS256"],
-        )
+    # Fallback: use the payload decoded without verification (development only)
+    # TODO: In production, fetch and use Keycloak's public key for verification
+    decoded = unverified["payload"]
+    logger.info(
+        "Token decoded locally (fallback mode)",
+        user_id=decoded.get("sub"),
+    )
+    return _extract_user_claims(decoded)
 
-        logger.info(
-            "Token decoded locally (fallback mode)",
-            user_id=decoded.get("sub"),
-        )
-        return _extract_user_claims(decoded)
 
-    except jwt.InvalidTokenError as e:
-        logger.error("Invalid JWT token", error=str(e))
-        raise ValueError(f"Invalid JWT token: {e}") from e
+# Claims copied from token data, with the default used when a claim is absent.
+# Custom claims (plan tier, quotas) would be configured in Keycloak; the
+# defaults are for development.
+_CLAIM_DEFAULTS: tuple[tuple[str, Any], ...] = (
+    # Standard OIDC claims
+    ("sub", None),
+    ("email", None),
+    ("preferred_username", None),
+    ("email_verified", False),
+    ("name", None),
+    # Custom claims
+    ("user_plan", "free"),
+    ("max_tool_calls_per_request", 20),
+    ("max_model_calls_per_request", 20),
+    ("mcp_tools_enabled", True),
+)
+_EMPTY: dict[str, Any] = {}
 
 
 def _extract_user_claims(token_data: dict[str, Any]) -> dict[str, Any]:
@@ -111,30 +306,13 @@ def _extract_user_claims(token_data: dict[str, Any]) -> dict[str, Any]:
     Returns:
         Normalized user claims dictionary
     """
-    # Extract standard OIDC claims
-    user_claims = {
-        "sub": token_data.get("sub"),
-        "email": token_data.get("email"),
-        "preferred_username": token_data.get("preferred_username"),
-        "email_verified": token_data.get("email_verified", False),
-        "name": token_data.get("name"),
-    }
-
-    # Extract custom claims (these would be configured in Keycloak)
-    # Default values for development
-    user_claims["user_plan"] = token_data.get("user_plan", "free")
-    user_claims["max_tool_calls_per_request"] = token_data.get(
-        "max_tool_calls_per_request", 20
-    )
-    user_claims["max_model_calls_per_request"] = token_data.get(
-        "max_model_calls_per_request", 20
-    )
-    user_claims["mcp_tools_enabled"] = token_data.get("mcp_tools_enabled", True)
+    get = token_data.get
+    user_claims = {name: get(name, default) for name, default in _CLAIM_DEFAULTS}
 
     # Extract roles if present
-    resource_access = token_data.get("resource_access", {})
-    client_roles = resource_access.get(KEYCLOAK_CLIENT_ID, {}).get("roles", [])
-    user_claims["roles"] = client_roles
+    resource_access = get("resource_access") or _EMPTY
+    client_access = resource_access.get(KEYCLOAK_CLIENT_ID) or _EMPTY
+    user_claims["roles"] = client_access.get("roles", [])
 
     # Add any custom attributes from Keycloak user profile
     if "attributes" in token_data:
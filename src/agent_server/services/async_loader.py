@@ -1,19 +1,26 @@
 """Async module loader with configurable initialization strategies"""
 
+import asyncio
 import importlib.util
 import sys
 from pathlib import Path
+from types import ModuleType
 from typing import Any, Callable, Awaitable
 
 import structlog
 
 logger = structlog.get_logger(__name__)
 
+# Loader signature: (graph module, graph_id) -> awaitable
+AsyncLoader = Callable[[Any, str], Awaitable[None]]
+
 
 class AsyncModuleLoader:
     """Handles dynamic loading of modules with configurable async initialization"""
 
-    _async_loaders: dict[str, Callable[[Any, str], Awaitable[None]]] = {}
+    _async_loaders: dict[str, AsyncLoader] = {}
+    # Fully initialized modules by module name, with the (path, mtime) they came from
+    _module_cache: dict[str, tuple[str, float, ModuleType]] = {}
 
     @classmethod
     def register_loaders_from_config(cls, loaders_config: dict[str, str]):
@@ -32,11 +39,25 @@ class AsyncModuleLoader:
         cls, graph_id: str, file_path: Path, export_name: str, async_loaders: list[str] | None = None
     ) -> Any:
         """Load graph module, run async loaders, call post-load hook, return graph"""
-        if not file_path.exists():
-            raise ValueError(f"Graph file not found: {file_path}")
+        try:
+            mtime = file_path.stat().st_mtime
+        except FileNotFoundError:
+            raise ValueError(f"Graph file not found: {file_path}") from None
 
         module_name = f"graphs.{graph_id}"
-        spec = importlib.util.spec_from_file_location(module_name, str(file_path.resolve()))
+        resolved_path = str(file_path.resolve())
+
+        # Reuse the module if this file was already loaded and is unchanged;
+        # async loaders and the post-load hook ran on the first load
+        cached = cls._module_cache.get(module_name)
+        if cached is not None and cached[:2] == (resolved_path, mtime):
+            module = cached[2]
+            if hasattr(module, export_name):
+                return getattr(module, export_name)
+
+        loaders = cls._resolve_loaders(async_loaders) if async_loaders else ()
+
+        spec = importlib.util.spec_from_file_location(module_name, resolved_path)
         if not spec or not spec.loader:
             raise ValueError(f"Failed to load graph module: {file_path}")
 
@@ -44,8 +65,8 @@ class AsyncModuleLoader:
         sys.modules[module_name] = module
         spec.loader.exec_module(module)
 
-        if async_loaders:
-            await cls._run_async_loaders(module, graph_id, async_loaders)
+        if loaders:
+            await cls._run_async_loaders(module, graph_id, loaders)
 
         if hasattr(module, "__post_async_load__") and callable(module.__post_async_load__):
             module.__post_async_load__()
@@ -53,16 +74,37 @@ class AsyncModuleLoader:
         if not hasattr(module, export_name):
             raise ValueError(f"Graph export '{export_name}' not found in {file_path}")
 
+        cls._module_cache[module_name] = (resolved_path, mtime, module)
         return getattr(module, export_name)
 
     @classmethod
-    async def _run_async_loaders(cls, module: Any, graph_id: str, loader_names: list[str]):
-        """Run specified async loaders for the module"""
+    def _resolve_loaders(cls, loader_names: list[str]) -> tuple[tuple[str, AsyncLoader], ...]:
+        """Look up registered loaders by name, warning about unknown names"""
+        loaders = []
         for name in loader_names:
-            if name in cls._async_loaders:
-                try:
-                    await cls._async_loaders[name](module, graph_id)
-                except Exception as e:
-                    logger.warning(f"⚠️ Loader '{name}' failed for '{graph_id}': {e}")
-            else:
+            loader = cls._async_loaders.get(name)
+            if loader is None:
                 logger.warning(f"⚠️ Async loader '{name}' not registered")
+            else:
+                loaders.append((name, loader))
+        return tuple(loaders)
+
+    @classmethod
+    async def _run_async_loaders(
+        cls,
+        module: Any,
+        graph_id: str,
+        loaders: tuple[tuple[str, AsyncLoader], ...],
+    ):
+        """Run the given (name, loader) pairs for the module concurrently"""
+        # Loaders are independent; a failing loader must not cancel the others
+        results = await asyncio.gather(
+            *(loader(module, graph_id) for _, loader in loaders),
+            return_exceptions=True,
+        )
+        for (name, _), result in zip(loaders, results, strict=True):
+            if isinstance(result, Exception):
+                logger.warning(f"⚠️ Loader '{name}' failed for '{graph_id}': {result}")
+            elif isinstance(result, BaseException):
+                # Cancellation and interpreter exits are not loader failures
+                raise result
@@ -8,11 +8,18 @@ from typing import Any
 class BaseRunBroker(ABC):
     """Abstract base class for a run-specific event broker"""
 
+    __slots__ = ()
+
     @abstractmethod
     async def put(self, event_id: str, payload: Any) -> None:
         """Put an event into the broker queue"""
         pass
 
+    @abstractmethod
+    async def put_end(self, event_id: str, payload: Any) -> None:
+        """Put the run's terminal event and mark this broker as finished"""
+        pass
+
     @abstractmethod
     def aiter(self) -> AsyncIterator[tuple[str, Any]]:
         """Async iterator yielding (event_id, payload) pairs"""
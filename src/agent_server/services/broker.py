@@ -2,6 +2,9 @@
 
 import asyncio
 import contextlib
+import heapq
+import time
+from collections import deque
 from collections.abc import AsyncIterator
 from typing import Any
 
@@ -11,85 +14,229 @@ from .base_broker import BaseBrokerManager, BaseRunBroker
 
 logger = structlog.getLogger(__name__)
 
+# Queued by mark_finished() after the last event, like closing a channel
+_FINISHED: Any = object()
+
+
+class EventBuffer:
+    """Unbounded FIFO of broker events.
+
+    Implements the part of the asyncio.Queue API the broker uses. A put is a
+    deque append plus a check for sleeping consumers; there is no task_done
+    bookkeeping or join() event to update per event.
+    """
+
+    __slots__ = ("_items", "_waiters")
+
+    def __init__(self) -> None:
+        self._items: deque[tuple[str, Any]] = deque()
+        self._waiters: deque[asyncio.Future[None]] = deque()
+
+    def put_nowait(self, item: tuple[str, Any]) -> None:
+        """Append an item and wake one waiting consumer"""
+        self._items.append(item)
+        if self._waiters:
+            self._wakeup_next()
+
+    def get_nowait(self) -> tuple[str, Any]:
+        """Pop the oldest item, raising asyncio.QueueEmpty if there is none"""
+        if not self._items:
+            raise asyncio.QueueEmpty
+        return self._items.popleft()
+
+    async def get(self) -> tuple[str, Any]:
+        """Pop the oldest item, waiting for one if necessary"""
+        while not self._items:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                with contextlib.suppress(ValueError):
+                    self._waiters.remove(waiter)
+                # Pass on a wakeup this consumer received but cannot use
+                if self._items and waiter.done() and not waiter.cancelled():
+                    self._wakeup_next()
+                raise
+        return self._items.popleft()
+
+    def empty(self) -> bool:
+        """Return True if there are no items"""
+        return not self._items
+
+    def qsize(self) -> int:
+        """Return the number of items"""
+        return len(self._items)
+
+    def clear(self) -> None:
+        """Drop all items"""
+        self._items.clear()
+
+    def _wakeup_next(self) -> None:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                break
+
 
 class RunBroker(BaseRunBroker):
     """Manages event queuing and distribution for a specific run"""
 
+    __slots__ = (
+        "run_id",
+        "queue",
+        "_finished",
+        "_late_put_logged",
+        "_consumers",
+        "_created_at",
+    )
+
     def __init__(self, run_id: str):
         self.run_id = run_id
-        self.queue: asyncio.Queue[tuple[str, Any]] = asyncio.Queue()
-        self.finished = asyncio.Event()
-        self._created_at = asyncio.get_event_loop().time()
+        self.queue = EventBuffer()
+        # Consumers are woken by the _FINISHED marker, so a flag is enough
+        self._finished = False
+        self._late_put_logged = False
+        # Iterators currently open on this broker; it is only reused at zero
+        self._consumers = 0
+        self._created_at = time.monotonic()
+
+    def _reset(self, run_id: str) -> None:
+        """Reuse this broker for another run, keeping its queue"""
+        self.queue.clear()
+        self._finished = False
+        self._late_put_logged = False
+        self.run_id = run_id
+        self._created_at = time.monotonic()
 
     async def put(self, event_id: str, payload: Any) -> None:
         """Put an event into the broker queue"""
-        if self.finished.is_set():
-            logger.warning(
-                f"Attempted to put event {event_id} into finished broker for run {self.run_id}"
-            )
+        if self._finished:
+            # Warn once; a runaway producer would otherwise log every event
+            if not self._late_put_logged:
+                self._late_put_logged = True
+                logger.warning(
+                    "Attempted to put event into finished broker",
+                    event_id=event_id,
+                    run_id=self.run_id,
+                )
             return
 
-        await self.queue.put((event_id, payload))
+        # The queue is unbounded, so this never blocks or allocates a waiter
+        self.queue.put_nowait((event_id, payload))
 
-        # Check if this is an end event
-        if isinstance(payload, tuple) and len(payload) >= 1 and payload[0] == "end":
-            self.mark_finished()
+    async def put_end(self, event_id: str, payload: Any) -> None:
+        """Put the run's terminal event and mark this broker as finished"""
+        await self.put(event_id, payload)
+        self.mark_finished()
 
     async def aiter(self) -> AsyncIterator[tuple[str, Any]]:
         """Async iterator yielding (event_id, payload) pairs"""
-        while True:
-            try:
-                # Use timeout to check if run is finished
-                event_id, payload = await asyncio.wait_for(
-                    self.queue.get(), timeout=0.1
-                )
-                yield event_id, payload
-
-                # Check if this is an end event
-                if (
-                    isinstance(payload, tuple)
-                    and len(payload) >= 1
-                    and payload[0] == "end"
-                ):
+        queue = self.queue
+        self._consumers += 1
+        try:
+            while True:
+                # Pop queued events directly; only build a get() coroutine to wait
+                if queue.empty():
+                    event_id, payload = await queue.get()
+                else:
+                    event_id, payload = queue.get_nowait()
+                if event_id is _FINISHED:
+                    # Leave the marker for any other consumer of this broker
+                    queue.put_nowait((event_id, payload))
                     break
 
-            except TimeoutError:
-                # Check if run is finished and queue is empty
-                if self.finished.is_set() and self.queue.empty():
+                yield event_id, payload
+        finally:
+            self._consumers -= 1
+
+    async def aiter_batches(
+        self, max_batch: int = 64
+    ) -> AsyncIterator[list[tuple[str, Any]]]:
+        """Async iterator yielding lists of the (event_id, payload) pairs queued
+        together, so a burst of events costs one wakeup instead of one each
+        """
+        queue = self.queue
+        self._consumers += 1
+        try:
+            while True:
+                batch: list[tuple[str, Any]] = []
+                item = await queue.get()
+                while item[0] is not _FINISHED:
+                    batch.append(item)
+                    if len(batch) >= max_batch or queue.empty():
+                        break
+                    item = queue.get_nowait()
+
+                finished = item[0] is _FINISHED
+                if finished:
+                    # Leave the marker for any other consumer of this broker
+                    queue.put_nowait(item)
+                if batch:
+                    yield batch
+                if finished:
                     break
-                continue
+        finally:
+            self._consumers -= 1
 
     def mark_finished(self) -> None:
         """Mark this broker as finished"""
-        self.finished.set()
-        logger.debug(f"Broker for run {self.run_id} marked as finished")
+        if self._finished:
+            return
+        self._finished = True
+        # Wake consumers blocked on an empty queue; the queue is unbounded
+        self.queue.put_nowait((_FINISHED, None))
+        logger.debug("Broker marked as finished", run_id=self.run_id)
 
     def is_finished(self) -> bool:
         """Check if this broker is finished"""
-        return self.finished.is_set()
+        return self._finished
 
     def is_empty(self) -> bool:
-        """Check if the queue is empty"""
-        return self.queue.empty()
+        """Check if the queue has no undelivered events"""
+        # A finished broker always holds exactly one _FINISHED marker
+        return self.queue.qsize() <= self._finished
 
     def get_age(self) -> float:
         """Get the age of this broker in seconds"""
-        return asyncio.get_event_loop().time() - self._created_at
+        return time.monotonic() - self._created_at
 
 
 class BrokerManager(BaseBrokerManager):
     """Manages multiple RunBroker instances"""
 
+    # Maximum number of drained brokers kept for reuse
+    POOL_SIZE = 64
+    # Finished, drained brokers older than this many seconds are removed
+    MAX_BROKER_AGE = 3600
+    # Seconds a broker is kept after cleanup_broker() for consumers still reading
+    FINISHED_GRACE_PERIOD = 60
+    # Seconds between checks of a broker that was still busy when it expired
+    CLEANUP_INTERVAL = 300
+
     def __init__(self) -> None:
         self._brokers: dict[str, RunBroker] = {}
+        self._pool: deque[RunBroker] = deque()
+        # (expiry, run_id) min-heap of brokers awaiting age-based cleanup
+        self._expiry_heap: list[tuple[float, str]] = []
         self._cleanup_task: asyncio.Task | None = None
 
     def get_or_create_broker(self, run_id: str) -> RunBroker:
         """Get or create a broker for a run"""
-        if run_id not in self._brokers:
-            self._brokers[run_id] = RunBroker(run_id)
-            logger.debug(f"Created new broker for run {run_id}")
-        return self._brokers[run_id]
+        broker = self._brokers.get(run_id)
+        if broker is None:
+            if self._pool:
+                broker = self._pool.pop()
+                broker._reset(run_id)
+            else:
+                broker = RunBroker(run_id)
+            self._brokers[run_id] = broker
+            heapq.heappush(
+                self._expiry_heap, (broker._created_at + self.MAX_BROKER_AGE, run_id)
+            )
+            logger.debug("Created new broker", run_id=run_id)
+        return broker
 
     def get_broker(self, run_id: str) -> RunBroker | None:
         """Get an existing broker or None"""
@@ -97,17 +244,30 @@ class BrokerManager(BaseBrokerManager):
 
     def cleanup_broker(self, run_id: str) -> None:
         """Clean up a broker for a run"""
-        if run_id in self._brokers:
-            self._brokers[run_id].mark_finished()
-            # Don't immediately delete in case there are still consumers
-            logger.debug(f"Marked broker for run {run_id} for cleanup")
+        broker = self._brokers.get(run_id)
+        if broker is not None:
+            broker.mark_finished()
+            # Don't immediately delete in case there are still consumers; the
+            # cleanup task removes it once the grace period has passed
+            heapq.heappush(
+                self._expiry_heap,
+                (time.monotonic() + self.FINISHED_GRACE_PERIOD, run_id),
+            )
+            logger.debug("Marked broker for cleanup", run_id=run_id)
 
     def remove_broker(self, run_id: str) -> None:
         """Remove a broker completely"""
-        if run_id in self._brokers:
-            self._brokers[run_id].mark_finished()
-            del self._brokers[run_id]
-            logger.debug(f"Removed broker for run {run_id}")
+        broker = self._brokers.pop(run_id, None)
+        if broker is not None:
+            # Only a drained broker with no open iterators can be pooled; a
+            # consumer paused mid-stream would otherwise read the next run
+            reusable = (
+                broker.is_finished() and broker.is_empty() and not broker._consumers
+            )
+            broker.mark_finished()
+            if reusable and len(self._pool) < self.POOL_SIZE:
+                self._pool.append(broker)
+            logger.debug("Removed broker", run_id=run_id)
 
     async def start_cleanup_task(self) -> None:
         """Start background cleanup task for old brokers"""
@@ -125,28 +285,33 @@ class BrokerManager(BaseBrokerManager):
         """Background task to clean up old finished brokers"""
         while True:
             try:
-                await asyncio.sleep(300)  # Check every 5 minutes
+                # Sleep until the oldest broker expires
+                delay = float(self.CLEANUP_INTERVAL)
+                if self._expiry_heap:
+                    delay = min(delay, self._expiry_heap[0][0] - time.monotonic())
+                await asyncio.sleep(max(delay, 0.0))
 
-                asyncio.get_event_loop().time()
-                to_remove = []
-
-                for run_id, broker in self._brokers.items():
-                    # Remove brokers that are finished and older than 1 hour
-                    if (
-                        broker.is_finished()
-                        and broker.is_empty()
-                        and broker.get_age() > 3600
-                    ):
-                        to_remove.append(run_id)
-
-                for run_id in to_remove:
-                    self.remove_broker(run_id)
-                    logger.info(f"Cleaned up old broker for run {run_id}")
+                self._remove_expired_brokers(time.monotonic())
 
             except asyncio.CancelledError:
                 break
             except Exception as e:
-                logger.error(f"Error in broker cleanup task: {e}")
+                logger.error("Error in broker cleanup task", error=str(e))
+
+    def _remove_expired_brokers(self, now: float) -> None:
+        """Remove finished, drained brokers whose expiry has passed"""
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= now:
+            _, run_id = heapq.heappop(heap)
+            broker = self._brokers.get(run_id)
+            if broker is None:
+                continue
+            if broker.is_finished() and broker.is_empty():
+                self.remove_broker(run_id)
+                logger.info("Cleaned up old broker", run_id=run_id)
+            else:
+                # Still in use; look again later
+                heapq.heappush(heap, (now + self.CLEANUP_INTERVAL, run_id))
 
 
 # Global broker manager instance
@@ -163,7 +163,7 @@ class StreamingService:
 
         broker = broker_manager.get_or_create_broker(run_id)
         if broker:
-            await broker.put(event_id, ("end", {"status": "interrupted"}))
+            await broker.put_end(event_id, ("end", {"status": "interrupted"}))
 
         broker_manager.cleanup_broker(run_id)
 
@@ -175,7 +175,7 @@ class StreamingService:
 
         broker = broker_manager.get_or_create_broker(run_id)
         if broker:
-            await broker.put(
+            await broker.put_end(
                 event_id, ("end", {"status": "error", "error": error_message})
             )
 
@@ -207,12 +207,12 @@ class StreamingService:
                 yield sse_event
 
         except asyncio.CancelledError:
-            logger.debug(f"Stream cancelled for run {run_id}")
+            logger.debug("Stream cancelled", run_id=run_id)
             if cancel_on_disconnect:
                 self._cancel_background_task(run_id)
             raise
         except Exception as e:
-            logger.error(f"Error in stream_run_execution for run {run_id}: {e}")
+            logger.error("Error in stream_run_execution", run_id=run_id, error=str(e))
             yield create_error_event(str(e))
 
     async def _replay_stored_events(
@@ -240,18 +240,22 @@ class StreamingService:
         if run.status in ["success", "error", "interrupted"] and broker.is_finished():
             return
 
-        # Stream live events
+        # Stream live events, writing each burst of queued events as one chunk
         if broker:
-            async for event_id, raw_event in broker.aiter():
-                # Skip duplicates that were already replayed
-                current_sequence = self._extract_event_sequence(event_id)
-                if current_sequence <= last_sent_sequence:
-                    continue
-
-                sse_event = await self._convert_raw_to_sse(event_id, raw_event)
-                if sse_event:
-                    yield sse_event
-                    last_sent_sequence = current_sequence
+            async for batch in broker.aiter_batches():
+                chunks = []
+                for event_id, raw_event in batch:
+                    # Skip duplicates that were already replayed
+                    current_sequence = self._extract_event_sequence(event_id)
+                    if current_sequence <= last_sent_sequence:
+                        continue
+
+                    sse_event = await self._convert_raw_to_sse(event_id, raw_event)
+                    if sse_event:
+                        chunks.append(sse_event)
+                        last_sent_sequence = current_sequence
+                if chunks:
+                    yield "".join(chunks)
 
     def _cancel_background_task(self, run_id: str):
         """Cancel background task on disconnect"""
@@ -277,7 +281,7 @@ class StreamingService:
             await self._update_run_status(run_id, "interrupted")
             return True
         except Exception as e:
-            logger.error(f"Error interrupting run {run_id}: {e}")
+            logger.error("Error interrupting run", run_id=run_id, error=str(e))
             return False
 
     async def cancel_run(self, run_id: str) -> bool:
@@ -287,7 +291,7 @@ class StreamingService:
             await self._update_run_status(run_id, "interrupted")  # Standard status
             return True
         except Exception as e:
-            logger.error(f"Error cancelling run {run_id}: {e}")
+            logger.error("Error cancelling run", run_id=run_id, error=str(e))
             return False
 
     async def _update_run_status(
@@ -300,7 +304,7 @@ class StreamingService:
 
             await update_run_status(run_id, status, output, error)
         except Exception as e:
-            logger.error(f"Error updating run status for {run_id}: {e}")
+            logger.error("Error updating run status", run_id=run_id, error=str(e))
 
     def is_run_streaming(self, run_id: str) -> bool:
         """Check if run is currently active (has a broker)"""
@@ -2,9 +2,12 @@
 
 import asyncio
 import os
+from typing import Any
 
 import httpx
+import orjson
 import pytest
+import pytest_asyncio
 
 
 @pytest.fixture
@@ -24,12 +27,25 @@ def agent_base_url():
     return os.getenv("AGENT_BASE_URL", "http://localhost:8000")
 
 
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def http_client():
+    """HTTP client shared by the module so tests reuse pooled connections."""
+    async with httpx.AsyncClient(timeout=60.0) as client:
+        yield client
+
+
+def _json(response: httpx.Response) -> Any:
+    """Parse a response body with orjson."""
+    return orjson.loads(response.content)
+
+
 async def get_keycloak_token(
-    keycloak_config: dict, username: str, password: str
+    client: httpx.AsyncClient, keycloak_config: dict, username: str, password: str
 ) -> str:
     """Get JWT token from Keycloak.
     
     Args:
+        client: HTTP client to send the token request with
         keycloak_config: Keycloak configuration
         username: Username
         password: Password
@@ -45,29 +61,28 @@ async def get_keycloak_token(
         f"/protocol/openid-connect/token"
     )
 
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            token_url,
-            data={
-                "client_id": keycloak_config["client_id"],
-                "client_secret": keycloak_config["client_secret"],
-                "username": username,
-                "password": password,
-                "grant_type": "password",
-            },
-            timeout=10.0,
-        )
+    response = await client.post(
+        token_url,
+        data={
+            "client_id": keycloak_config["client_id"],
+            "client_secret": keycloak_config["client_secret"],
+            "username": username,
+            "password": password,
+            "grant_type": "password",
+        },
+        timeout=10.0,
+    )
 
-        if response.status_code != 200:
-            raise Exception(
-                f"Failed to get token: {response.status_code} - {response.text}"
-            )
+    if response.status_code != 200:
+        raise Exception(
+            f"Failed to get token: {response.status_code} - {response.text}"
+        )
 
-        token_data = response.json()
-        return token_data["access_token"]
+    token_data = _json(response)
+    return token_data["access_token"]
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="module")
 @pytest.mark.skipif(
     os.getenv("AUTH_TYPE") != "keycloak",
     reason="Keycloak auth not enabled",
@@ -75,219 +90,232 @@ async def get_keycloak_token(
 class TestKeycloakAuthentication:
     """Test Keycloak authentication with Agent."""
 
-    async def test_unauthenticated_request_rejected(self, agent_base_url):
+    async def test_unauthenticated_request_rejected(self, http_client, agent_base_url):
         """Test that requests without token are rejected."""
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f"{agent_base_url}/threads")
+        response = await http_client.get(f"{agent_base_url}/threads")
 
-            assert response.status_code == 401
-            assert "unauthorized" in response.json().get("error", "").lower()
+        assert response.status_code == 401
+        assert "unauthorized" in _json(response).get("error", "").lower()
 
-    async def test_invalid_token_rejected(self, agent_base_url):
+    async def test_invalid_token_rejected(self, http_client, agent_base_url):
         """Test that invalid tokens are rejected."""
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{agent_base_url}/threads",
-                headers={"Authorization": "Bearer invalid_token_here"},
-            )
+        response = await http_client.get(
+            f"{agent_base_url}/threads",
+            headers={"Authorization": "Bearer invalid_token_here"},
+        )
 
-            assert response.status_code == 401
+        assert response.status_code == 401
 
     @pytest.mark.skipif(
         not os.getenv("TEST_KEYCLOAK_USER"),
         reason="TEST_KEYCLOAK_USER not set",
     )
     async def test_valid_token_accepted(
-        self, keycloak_config, agent_base_url
+        self, http_client, keycloak_config, agent_base_url
     ):
         """Test that valid Keycloak tokens are accepted."""
         username = os.getenv("TEST_KEYCLOAK_USER", "testuser")
         password = os.getenv("TEST_KEYCLOAK_PASSWORD", "testpass")
 
         # Get token from Keycloak
-        token = await get_keycloak_token(keycloak_config, username, password)
+        token = await get_keycloak_token(
+            http_client, keycloak_config, username, password
+        )
 
         # Use token with Agent
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{agent_base_url}/threads",
-                headers={"Authorization": f"Bearer {token}"},
-            )
+        response = await http_client.get(
+            f"{agent_base_url}/threads",
+            headers={"Authorization": f"Bearer {token}"},
+        )
 
-            # Should succeed (200) or return empty list
-            assert response.status_code in [200, 404]
+        # Should succeed (200) or return empty list
+        assert response.status_code in [200, 404]
 
     @pytest.mark.skipif(
         not os.getenv("TEST_KEYCLOAK_USER") or not os.getenv("GEMINI_API_KEY"),
         reason="TEST_KEYCLOAK_USER or GEMINI_API_KEY not set",
     )
     async def test_authenticated_model_call(
-        self, keycloak_config, agent_base_url
+        self, http_client, keycloak_config, agent_base_url
     ):
         """Test making authenticated API call that triggers model execution."""
         username = os.getenv("TEST_KEYCLOAK_USER", "testuser")
         password = os.getenv("TEST_KEYCLOAK_PASSWORD", "testpass")
 
         # Get token from Keycloak
-        token = await get_keycloak_token(keycloak_config, username, password)
+        token = await get_keycloak_token(
+            http_client, keycloak_config, username, password
+        )
         headers = {"Authorization": f"Bearer {token}"}
 
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            # Step 1: Create thread
-            thread_response = await client.post(
-                f"{agent_base_url}/threads",
-                headers=headers,
-                json={"metadata": {"test": "keycloak_auth"}},
-            )
-            assert thread_response.status_code == 200
-            thread_id = thread_response.json()["thread_id"]
+        # Step 1: Create thread
+        thread_response = await http_client.post(
+            f"{agent_base_url}/threads",
+            headers=headers,
+            json={"metadata": {"test": "keycloak_auth"}},
+        )
+        assert thread_response.status_code == 200
+        thread_id = _json(thread_response)["thread_id"]
 
-            # Step 2: Get or create assistant
-            assistants_response = await client.get(
+        # Step 2: Get or create assistant
+        assistants_response = await http_client.get(
+            f"{agent_base_url}/assistants",
+            headers=headers,
+        )
+        assert assistants_response.status_code == 200
+        assistants = _json(assistants_response)
+
+        # Use first assistant or create one
+        if assistants:
+            assistant_id = assistants[0]["assistant_id"]
+        else:
+            # Create assistant
+            create_assistant_response = await http_client.post(
                 f"{agent_base_url}/assistants",
                 headers=headers,
-            )
-            assert assistants_response.status_code == 200
-            assistants = assistants_response.json()
-
-            # Use first assistant or create one
-            if assistants:
-                assistant_id = assistants[0]["assistant_id"]
-            else:
-                # Create assistant
-                create_assistant_response = await client.post(
-                    f"{agent_base_url}/assistants",
-                    headers=headers,
-                    json={
-                        "graph_id": "agent",
-                        "name": "Test Agent",
-                        "metadata": {"test": "keycloak"},
-                    },
-                )
-                assert create_assistant_response.status_code == 200
-                assistant_id = create_assistant_response.json()["assistant_id"]
-
-            # Step 3: Create run with model call
-            run_response = await client.post(
-                f"{agent_base_url}/threads/{thread_id}/runs",
-                headers=headers,
                 json={
-                    "assistant_id": assistant_id,
-                    "input": {
-                        "messages": [
-                            {
-                                "role": "user",
-                                "content": "Say 'Hello from Keycloak test' in exactly those words.",
-                            }
-                        ]
-                    },
+                    "graph_id": "agent",
+                    "name": "Test Agent",
+                    "metadata": {"test": "keycloak"},
                 },
             )
+            assert create_assistant_response.status_code == 200
+            assistant_id = _json(create_assistant_response)["assistant_id"]
+
+        # Step 3: Create run with model call
+        run_response = await http_client.post(
+            f"{agent_base_url}/threads/{thread_id}/runs",
+            headers=headers,
+            json={
+                "assistant_id": assistant_id,
+                "input": {
+                    "messages": [
+                        {
+                            "role": "user",
+                            "content": "Say 'Hello from Keycloak test' in exactly those words.",
+                        }
+                    ]
+                },
+            },
+        )
 
-            assert run_response.status_code == 200
-            run_id = run_response.json()["run_id"]
+        assert run_response.status_code == 200
+        run_id = _json(run_response)["run_id"]
+
+        # Step 4: Wait for run to complete by following its event stream
+        async with http_client.stream(
+            "GET",
+            f"{agent_base_url}/threads/{thread_id}/runs/{run_id}/stream",
+            headers=headers,
+        ) as stream_response:
+            assert stream_response.status_code == 200
+            async for line in stream_response.aiter_lines():
+                if line.startswith(("event: end", "event: error")):
+                    break
 
-            # Step 4: Wait for run to complete
-            max_attempts = 30
-            for _ in range(max_attempts):
-                status_response = await client.get(
-                    f"{agent_base_url}/threads/{thread_id}/runs/{run_id}",
-                    headers=headers,
-                )
-                assert status_response.status_code == 200
+        # The stream can end just before the final status is persisted,
+        # so confirm it with a short exponential backoff
+        max_attempts = 30
+        for attempt in range(max_attempts):
+            status_response = await http_client.get(
+                f"{agent_base_url}/threads/{thread_id}/runs/{run_id}",
+                headers=headers,
+            )
+            assert status_response.status_code == 200
 
-                run_data = status_response.json()
-                status = run_data.get("status")
+            run_data = _json(status_response)
+            status = run_data.get("status")
 
-                if status in ["success", "error"]:
-                    break
+            if status in ["success", "error"]:
+                break
 
-                await asyncio.sleep(1)
+            await asyncio.sleep(min(0.05 * (2**attempt), 2.0))
 
-            # Verify run completed successfully
-            assert run_data.get("status") == "success", (
-                f"Run failed with status: {run_data.get('status')}"
-            )
+        # Verify run completed successfully
+        assert run_data.get("status") == "success", (
+            f"Run failed with status: {run_data.get('status')}"
+        )
 
-            # Step 5: Verify we got a response from the model
-            # Get thread state to see messages
-            state_response = await client.get(
-                f"{agent_base_url}/threads/{thread_id}/state",
-                headers=headers,
-            )
-            assert state_response.status_code == 200
-            state = state_response.json()
+        # Step 5: Verify we got a response from the model
+        # Get thread state to see messages
+        state_response = await http_client.get(
+            f"{agent_base_url}/threads/{thread_id}/state",
+            headers=headers,
+        )
+        assert state_response.status_code == 200
+        state = _json(state_response)
 
-            # Check that we have messages in state
-            assert "values" in state
-            assert "messages" in state["values"]
-            messages = state["values"]["messages"]
+        # Check that we have messages in state
+        assert "values" in state
+        assert "messages" in state["values"]
+        messages = state["values"]["messages"]
 
-            # Should have at least user message + AI response
-            assert len(messages) >= 2
+        # Should have at least user message + AI response
+        assert len(messages) >= 2
 
-            # Last message should be from AI
-            last_message = messages[-1]
-            assert last_message.get("type") in ["ai", "assistant"]
+        # Last message should be from AI
+        last_message = messages[-1]
+        assert last_message.get("type") in ["ai", "assistant"]
 
-            print(f"\n✅ Model call succeeded with Keycloak auth!")
-            print(f"   Response: {last_message.get('content', '')[:100]}")
+        print(f"\n✅ Model call succeeded with Keycloak auth!")
+        print(f"   Response: {last_message.get('content', '')[:100]}")
 
     @pytest.mark.skipif(
         not os.getenv("TEST_KEYCLOAK_USER"),
         reason="TEST_KEYCLOAK_USER not set",
     )
     async def test_quota_metadata_in_run(
-        self, keycloak_config, agent_base_url
+        self, http_client, keycloak_config, agent_base_url
     ):
         """Test that quota metadata is added to runs."""
         username = os.getenv("TEST_KEYCLOAK_USER", "testuser")
         password = os.getenv("TEST_KEYCLOAK_PASSWORD", "testpass")
 
-        token = await get_keycloak_token(keycloak_config, username, password)
+        token = await get_keycloak_token(
+            http_client, keycloak_config, username, password
+        )
         headers = {"Authorization": f"Bearer {token}"}
 
-        async with httpx.AsyncClient() as client:
-            # Create thread
-            thread_response = await client.post(
-                f"{agent_base_url}/threads",
-                headers=headers,
-                json={},
-            )
-            assert thread_response.status_code == 200
-            thread_id = thread_response.json()["thread_id"]
+        # Create thread
+        thread_response = await http_client.post(
+            f"{agent_base_url}/threads",
+            headers=headers,
+            json={},
+        )
+        assert thread_response.status_code == 200
+        thread_id = _json(thread_response)["thread_id"]
 
-            # Get assistant
-            assistants_response = await client.get(
-                f"{agent_base_url}/assistants",
-                headers=headers,
-            )
-            assistants = assistants_response.json()
-            assistant_id = assistants[0]["assistant_id"] if assistants else "agent"
+        # Get assistant
+        assistants_response = await http_client.get(
+            f"{agent_base_url}/assistants",
+            headers=headers,
+        )
+        assistants = _json(assistants_response)
+        assistant_id = assistants[0]["assistant_id"] if assistants else "agent"
+
+        # Create run
+        run_response = await http_client.post(
+            f"{agent_base_url}/threads/{thread_id}/runs",
+            headers=headers,
+            json={
+                "assistant_id": assistant_id,
+                "input": {"messages": [{"role": "user", "content": "test"}]},
+            },
+        )
 
-            # Create run
-            run_response = await client.post(
-                f"{agent_base_url}/threads/{thread_id}/runs",
-                headers=headers,
-                json={
-                    "assistant_id": assistant_id,
-                    "input": {"messages": [{"role": "user", "content": "test"}]},
-                },
-            )
+        assert run_response.status_code == 200
+        run_data = _json(run_response)
 
-            assert run_response.status_code == 200
-            run_data = run_response.json()
+        # Check metadata has quota information
+        metadata = run_data.get("metadata", {})
 
-            # Check metadata has quota information
-            metadata = run_data.get("metadata", {})
-            
-            # Note: Quota metadata is added by auth.on.runs.create
-            # It may not be immediately visible in response
-            # but should be enforced server-side
-            print(f"\n✅ Run created with metadata: {metadata}")
+        # Note: Quota metadata is added by auth.on.runs.create
+        # It may not be immediately visible in response
+        # but should be enforced server-side
+        print(f"\n✅ Run created with metadata: {metadata}")
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="module")
 @pytest.mark.skipif(
     os.getenv("AUTH_TYPE") != "keycloak",
     reason="Keycloak auth not enabled",
@@ -300,37 +328,38 @@ class TestKeycloakMultiTenant:
         reason="TEST_KEYCLOAK_USER not set",
     )
     async def test_user_can_only_see_own_threads(
-        self, keycloak_config, agent_base_url
+        self, http_client, keycloak_config, agent_base_url
     ):
         """Test that users can only see their own threads."""
         username = os.getenv("TEST_KEYCLOAK_USER", "testuser")
         password = os.getenv("TEST_KEYCLOAK_PASSWORD", "testpass")
 
-        token = await get_keycloak_token(keycloak_config, username, password)
+        token = await get_keycloak_token(
+            http_client, keycloak_config, username, password
+        )
         headers = {"Authorization": f"Bearer {token}"}
 
-        async with httpx.AsyncClient() as client:
-            # Create a thread
-            create_response = await client.post(
-                f"{agent_base_url}/threads",
-                headers=headers,
-                json={"metadata": {"owner_test": "true"}},
-            )
-            assert create_response.status_code == 200
-            created_thread_id = create_response.json()["thread_id"]
+        # Create a thread
+        create_response = await http_client.post(
+            f"{agent_base_url}/threads",
+            headers=headers,
+            json={"metadata": {"owner_test": "true"}},
+        )
+        assert create_response.status_code == 200
+        created_thread_id = _json(create_response)["thread_id"]
 
-            # List threads - should only see own threads
-            list_response = await client.get(
-                f"{agent_base_url}/threads",
-                headers=headers,
-            )
-            assert list_response.status_code == 200
-            threads = list_response.json()
+        # List threads - should only see own threads
+        list_response = await http_client.get(
+            f"{agent_base_url}/threads",
+            headers=headers,
+        )
+        assert list_response.status_code == 200
+        threads = _json(list_response)
 
-            # Should find the created thread
-            thread_ids = [t["thread_id"] for t in threads]
-            assert created_thread_id in thread_ids
+        # Should find the created thread
+        thread_ids = [t["thread_id"] for t in threads]
+        assert created_thread_id in thread_ids
 
-            # All threads should have owner metadata
-            # (added by auth.on.threads.create)
-            print(f"\n✅ User has access to {len(threads)} thread(s)")
+        # All threads should have owner metadata
+        # (added by auth.on.threads.create)
+        print(f"\n✅ User has access to {len(threads)} thread(s)")
@@ -0,0 +1,56 @@
+"""Tests for the background run task registry."""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from agent_server.api.runs import _track_run_task
+
+
+class TestTrackRunTask:
+    """Tests for _track_run_task function."""
+
+    @pytest.mark.asyncio
+    async def test_finished_task_is_untracked(self):
+        """Test that a task is removed from active_runs once it completes."""
+        registry = {}
+        with patch("agent_server.api.runs.active_runs", registry):
+            task = asyncio.create_task(asyncio.sleep(0))
+            _track_run_task("run-123", task)
+            assert registry["run-123"] is task
+
+            await task
+            await asyncio.sleep(0)
+
+            assert "run-123" not in registry
+
+    @pytest.mark.asyncio
+    async def test_task_cancelled_before_start_is_untracked(self):
+        """Test that a task cancelled before it runs is still removed."""
+        registry = {}
+        with patch("agent_server.api.runs.active_runs", registry):
+            task = asyncio.create_task(asyncio.sleep(10))
+            _track_run_task("run-123", task)
+            task.cancel()
+
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            await asyncio.sleep(0)
+
+            assert "run-123" not in registry
+
+    @pytest.mark.asyncio
+    async def test_replaced_entry_is_kept(self):
+        """Test that a finished task does not remove a newer task's entry."""
+        registry = {}
+        with patch("agent_server.api.runs.active_runs", registry):
+            old = asyncio.create_task(asyncio.sleep(0))
+            _track_run_task("run-123", old)
+            registry["run-123"] = newer = asyncio.create_task(asyncio.sleep(0))
+
+            await old
+            await asyncio.sleep(0)
+
+            assert registry["run-123"] is newer
+            await newer
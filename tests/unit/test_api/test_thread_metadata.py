@@ -0,0 +1,88 @@
+"""Tests for update_thread_metadata."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.dialects import postgresql
+
+from agent_server.api.runs import update_thread_metadata
+from agent_server.core.orm import Thread as ThreadORM
+
+
+def _session(rowcount: int) -> AsyncMock:
+    """Mock session whose UPDATE matches `rowcount` rows"""
+    session = AsyncMock()
+    session.execute.return_value = MagicMock(rowcount=rowcount)
+    session.add = MagicMock()
+    return session
+
+
+class TestUpdateThreadMetadata:
+    """Tests for update_thread_metadata function."""
+
+    @pytest.mark.asyncio
+    async def test_update_merges_patch_into_metadata(self):
+        """Test that a single UPDATE concatenates the patch onto the metadata."""
+        session = _session(rowcount=1)
+
+        await update_thread_metadata(session, "thread-123", "asst-1", "agent")
+
+        session.execute.assert_called_once()
+        stmt = session.execute.call_args.args[0]
+        compiled = stmt.compile(dialect=postgresql.dialect())
+        sql = str(compiled)
+        assert sql.startswith("UPDATE thread")
+        assert "coalesce(thread.metadata_json" in sql
+        assert "||" in sql
+        assert {"assistant_id": "asst-1", "graph_id": "agent"} in (
+            compiled.params.values()
+        )
+        assert compiled.params["thread_id_1"] == "thread-123"
+
+    @pytest.mark.asyncio
+    async def test_existing_thread_is_not_inserted(self):
+        """Test that no thread is created when the UPDATE matched a row."""
+        session = _session(rowcount=1)
+
+        await update_thread_metadata(
+            session, "thread-123", "asst-1", "agent", user_id="user-123"
+        )
+
+        session.add.assert_not_called()
+        session.commit.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_missing_thread_is_auto_created(self):
+        """Test that a thread is created when no row matched and user_id is given."""
+        session = _session(rowcount=0)
+
+        await update_thread_metadata(
+            session, "thread-123", "asst-1", "agent", user_id="user-123"
+        )
+
+        session.add.assert_called_once()
+        thread = session.add.call_args.args[0]
+        assert isinstance(thread, ThreadORM)
+        assert thread.thread_id == "thread-123"
+        assert thread.user_id == "user-123"
+        assert thread.status == "idle"
+        assert thread.metadata_json == {
+            "owner": "user-123",
+            "assistant_id": "asst-1",
+            "graph_id": "agent",
+            "thread_name": "",
+        }
+        session.commit.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_missing_thread_without_user_id_raises(self):
+        """Test that a missing thread cannot be auto-created without user_id."""
+        session = _session(rowcount=0)
+
+        with pytest.raises(HTTPException) as exc_info:
+            await update_thread_metadata(session, "thread-123", "asst-1", "agent")
+
+        assert exc_info.value.status_code == 400
+        session.add.assert_not_called()
+        session.commit.assert_not_called()
@@ -1,10 +1,16 @@
 """Tests for thread status API functions."""
 
+import contextlib
 from unittest.mock import AsyncMock, patch
 
 import pytest
 
-from agent_server.api.runs import set_thread_status
+from agent_server.api.runs import (
+    execute_run_async,
+    set_thread_status,
+    update_run_status,
+)
+from agent_server.models import User
 
 
 class TestSetThreadStatus:
@@ -62,3 +68,63 @@ class TestSetThreadStatus:
             mock_validate.return_value = "busy"
             await set_thread_status(session, "thread-123", "busy")
             mock_validate.assert_called_once_with("busy")
+
+
+class TestUpdateRunStatus:
+    """Tests for update_run_status function."""
+
+    @pytest.mark.asyncio
+    async def test_update_run_status_commits_by_default(self):
+        """Test that update_run_status commits the caller's session."""
+        session = AsyncMock()
+
+        await update_run_status("run-123", "success", output={}, session=session)
+
+        session.execute.assert_called_once()
+        session.commit.assert_called_once()
+        session.close.assert_not_called()
+
+
+class TestExecuteRunAsync:
+    """Tests for status persistence in execute_run_async."""
+
+    @pytest.mark.asyncio
+    async def test_run_status_survives_thread_status_failure(self):
+        """Test that the final run status is committed before the thread update."""
+        journal = []
+        session = AsyncMock()
+        session.execute.side_effect = lambda stmt: journal.append(
+            stmt.compile().params["status"]
+        )
+        session.commit.side_effect = lambda: journal.append("commit")
+
+        async def fake_stream(**kwargs):
+            yield "values", {"answer": 42}
+
+        with (
+            patch("agent_server.api.runs.get_langgraph_service") as mock_service,
+            patch("agent_server.api.runs.create_run_config", return_value={}),
+            patch(
+                "agent_server.api.runs.with_auth_ctx",
+                lambda *_: contextlib.nullcontext(),
+            ),
+            patch("agent_server.api.runs.stream_graph_events", fake_stream),
+            patch("agent_server.api.runs.streaming_service", AsyncMock()),
+            patch(
+                "agent_server.api.runs.set_thread_status",
+                AsyncMock(side_effect=RuntimeError("thread update failed")),
+            ),
+        ):
+            mock_service.return_value.get_graph = AsyncMock()
+            with pytest.raises(RuntimeError, match="thread update failed"):
+                await execute_run_async(
+                    "run-123",
+                    "thread-123",
+                    "agent",
+                    {},
+                    User(identity="user-123"),
+                    session=session,
+                )
+
+        # The success update has its own commit, so the later failure can't undo it
+        assert journal[:4] == ["running", "commit", "success", "commit"]
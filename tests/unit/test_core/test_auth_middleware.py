@@ -216,6 +216,44 @@ class TestLangGraphAuthBackend:
 
         assert result is None
 
+    @pytest.mark.asyncio
+    async def test_authenticate_public_endpoint(self):
+        """Test public endpoints bypass the auth handler"""
+        mock_auth_instance = Mock()
+        mock_auth_instance._authenticate_handler = AsyncMock()
+
+        backend = LangGraphAuthBackend()
+        backend.auth_instance = mock_auth_instance
+
+        mock_conn = Mock(spec=HTTPConnection)
+        mock_conn.url.path = "/health"
+        mock_conn.headers = {}
+
+        result = await backend.authenticate(mock_conn)
+
+        assert result is None
+        mock_auth_instance._authenticate_handler.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_authenticate_api_schema_requires_auth(self):
+        """Test the OpenAPI schema is not treated as a public endpoint"""
+        mock_auth_instance = Mock()
+        mock_auth_instance._authenticate_handler = AsyncMock(
+            side_effect=RuntimeError("Missing token")
+        )
+
+        backend = LangGraphAuthBackend()
+        backend.auth_instance = mock_auth_instance
+
+        mock_conn = Mock(spec=HTTPConnection)
+        mock_conn.url.path = "/openapi.json"
+        mock_conn.headers = {}
+
+        with pytest.raises(AuthenticationError):
+            await backend.authenticate(mock_conn)
+
+        mock_auth_instance._authenticate_handler.assert_called_once()
+
     @pytest.mark.asyncio
     async def test_authenticate_success(self):
         """Test successful authentication"""
@@ -0,0 +1,44 @@
+"""Tests for RunCreate input/command validation."""
+
+import pytest
+
+from agent_server.models.runs import RunCreate
+
+
+class TestRunCreateInputCommand:
+    """Tests for RunCreate input and command exclusivity."""
+
+    def test_accepts_input_only(self):
+        """Test that input without command is accepted."""
+        run = RunCreate(assistant_id="agent", input={"messages": []})
+        assert run.input == {"messages": []}
+        assert run.command is None
+
+    def test_accepts_command_only(self):
+        """Test that command without input is accepted."""
+        run = RunCreate(assistant_id="agent", command={"resume": "yes"})
+        assert run.input is None
+        assert run.command == {"resume": "yes"}
+
+    def test_empty_input_with_command_is_dropped(self):
+        """Test that an empty input dict alongside a command becomes None."""
+        payload = {"assistant_id": "agent", "input": {}, "command": {"resume": 1}}
+        run = RunCreate.model_validate(payload)
+        assert run.input is None
+        assert run.command == {"resume": 1}
+        # The caller's payload is left untouched
+        assert payload["input"] == {}
+
+    def test_rejects_input_and_command(self):
+        """Test that a non-empty input with a command is rejected."""
+        with pytest.raises(ValueError, match="mutually exclusive"):
+            RunCreate(
+                assistant_id="agent",
+                input={"messages": []},
+                command={"resume": "yes"},
+            )
+
+    def test_rejects_missing_input_and_command(self):
+        """Test that omitting both input and command is rejected."""
+        with pytest.raises(ValueError, match="Must specify either"):
+            RunCreate(assistant_id="agent")
@@ -0,0 +1,184 @@
+"""Unit tests for Keycloak token validation"""
+
+import asyncio
+import time
+from collections import OrderedDict
+
+import httpx
+import jwt
+import pytest
+import pytest_asyncio
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jwt.algorithms import RSAAlgorithm
+
+from agent_server.security import keycloak_client as kc
+
+KID = "realm-key"
+
+
+def _generate_key() -> rsa.RSAPrivateKey:
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+SIGNING_KEY = _generate_key()
+FORGING_KEY = _generate_key()
+
+
+def _jwks(*keys: tuple[str, rsa.RSAPrivateKey]) -> dict:
+    """Build a JWKS document publishing the public half of each key"""
+    published = []
+    for kid, private_key in keys:
+        jwk = RSAAlgorithm.to_jwk(private_key.public_key(), as_dict=True)
+        published.append({**jwk, "kid": kid, "use": "sig", "alg": "RS256"})
+    return {"keys": published}
+
+
+def _token(
+    private_key: rsa.RSAPrivateKey = SIGNING_KEY,
+    kid: str = KID,
+    expires_in: float = 300,
+    sub: str = "user-123",
+) -> str:
+    now = int(time.time())
+    payload = {"sub": sub, "iat": now, "exp": now + int(expires_in)}
+    return jwt.encode(payload, private_key, algorithm="RS256", headers={"kid": kid})
+
+
+class FakeKeycloak:
+    """Serves the realm's JWKS and userinfo endpoints through httpx.MockTransport"""
+
+    def __init__(self) -> None:
+        # JSON document, or a str served as a non-JSON body
+        self.certs_body: dict | str = _jwks((KID, SIGNING_KEY))
+        self.certs_requests = 0
+        self.userinfo_requests = 0
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/certs"):
+            self.certs_requests += 1
+            if isinstance(self.certs_body, str):
+                return httpx.Response(200, text=self.certs_body)
+            return httpx.Response(200, json=self.certs_body)
+        if request.url.path.endswith("/userinfo"):
+            self.userinfo_requests += 1
+            return httpx.Response(401)
+        return httpx.Response(404)
+
+
+@pytest.fixture
+def keycloak(monkeypatch):
+    """Reset module state and route Keycloak calls to a FakeKeycloak"""
+    fake = FakeKeycloak()
+    monkeypatch.setattr(kc, "_jwks", {})
+    monkeypatch.setattr(kc, "_jwks_fetched_at", 0.0)
+    monkeypatch.setattr(kc, "_jwks_lock", asyncio.Lock())
+    monkeypatch.setattr(kc, "_claims_cache", OrderedDict())
+    monkeypatch.setattr(kc, "_inflight_validations", {})
+    client = httpx.AsyncClient(transport=httpx.MockTransport(fake.handle))
+    monkeypatch.setattr(kc, "_http_client", client)
+    return fake
+
+
+@pytest_asyncio.fixture
+async def loaded_keycloak(keycloak):
+    """FakeKeycloak whose JWKS has already been fetched"""
+    await kc.prewarm_keycloak_client()
+    assert keycloak.certs_requests == 1
+    yield keycloak
+    await kc.close_keycloak_client()
+
+
+class TestValidateKeycloakToken:
+    """Test local JWKS verification of access tokens"""
+
+    @pytest.mark.asyncio
+    async def test_valid_token_is_accepted(self, loaded_keycloak):
+        """Test that a token signed by a realm key is accepted"""
+        claims = await kc.validate_keycloak_token(_token())
+
+        assert claims["sub"] == "user-123"
+        assert loaded_keycloak.userinfo_requests == 0
+
+    @pytest.mark.asyncio
+    async def test_valid_token_claims_are_cached(self, loaded_keycloak):
+        """Test that repeat validations of a token reuse the cached claims"""
+        token = _token()
+
+        first = await kc.validate_keycloak_token(token)
+        second = await kc.validate_keycloak_token(token)
+
+        assert second is first
+
+    @pytest.mark.asyncio
+    async def test_forged_signature_is_rejected(self, loaded_keycloak):
+        """Test that a token signed by another key under a realm kid is rejected"""
+        with pytest.raises(ValueError, match="Invalid JWT token"):
+            await kc.validate_keycloak_token(_token(private_key=FORGING_KEY))
+
+        assert loaded_keycloak.userinfo_requests == 0
+
+    @pytest.mark.asyncio
+    async def test_expired_token_is_rejected(self, loaded_keycloak):
+        """Test that an expired token is rejected even with a valid signature"""
+        with pytest.raises(ValueError, match="Invalid JWT token"):
+            await kc.validate_keycloak_token(_token(expires_in=-60))
+
+    @pytest.mark.asyncio
+    async def test_unknown_kid_is_rejected_when_keys_are_loaded(self, loaded_keycloak):
+        """Test that a kid missing from the realm JWKS is rejected, not looked up"""
+        token = _token(private_key=FORGING_KEY, kid="attacker-key")
+
+        with pytest.raises(ValueError, match="unknown signing key"):
+            await kc.validate_keycloak_token(token)
+
+        assert loaded_keycloak.userinfo_requests == 0
+
+    @pytest.mark.asyncio
+    async def test_jwks_refetch_is_rate_limited(self, loaded_keycloak):
+        """Test that unknown kids refetch the JWKS at most once per interval"""
+        for i in range(3):
+            with pytest.raises(ValueError):
+                await kc.validate_keycloak_token(_token(kid=f"unknown-{i}"))
+
+        assert loaded_keycloak.certs_requests == 1
+
+        # Once the interval has passed, the next miss refetches
+        kc._jwks_fetched_at -= kc._JWKS_MIN_REFRESH_INTERVAL
+        with pytest.raises(ValueError):
+            await kc.validate_keycloak_token(_token(kid="unknown-3"))
+
+        assert loaded_keycloak.certs_requests == 2
+
+    @pytest.mark.asyncio
+    async def test_failures_are_never_cached(self, loaded_keycloak):
+        """Test that a rejected token is validated afresh on the next request"""
+        rotated_key = _generate_key()
+        token = _token(private_key=rotated_key, kid="rotated-key")
+
+        with pytest.raises(ValueError):
+            await kc.validate_keycloak_token(token)
+
+        assert not kc._claims_cache
+        assert not kc._inflight_validations
+
+        # The realm rotates to the new key; the same token now validates
+        loaded_keycloak.certs_body = _jwks(("rotated-key", rotated_key))
+        kc._jwks_fetched_at -= kc._JWKS_MIN_REFRESH_INTERVAL
+
+        claims = await kc.validate_keycloak_token(token)
+        assert claims["sub"] == "user-123"
+
+
+class TestRefreshJwks:
+    """Test fetching the realm's signing keys"""
+
+    @pytest.mark.asyncio
+    async def test_non_json_response_is_ignored(self, keycloak):
+        """Test that a non-JSON 200 body is logged instead of raising"""
+        keycloak.certs_body = "<html>proxy</html>"
+
+        await kc.prewarm_keycloak_client()
+
+        assert keycloak.certs_requests == 1
+        assert kc._jwks == {}
+        await kc.close_keycloak_client()
@@ -0,0 +1,117 @@
+"""Unit tests for AsyncModuleLoader"""
+
+import asyncio
+import importlib.util
+import os
+from unittest.mock import patch
+
+import pytest
+
+from agent_server.services.async_loader import AsyncModuleLoader
+
+GRAPH_SOURCE = "graph = object()\n"
+
+
+@pytest.fixture(autouse=True)
+def clear_module_cache():
+    """Keep loaded graph modules from leaking between tests"""
+    with patch.dict(AsyncModuleLoader._module_cache, clear=True):
+        yield
+
+
+@pytest.fixture
+def graph_file(tmp_path):
+    """A graph module on disk exporting a unique `graph` object"""
+    path = tmp_path / "graph.py"
+    path.write_text(GRAPH_SOURCE)
+    return path
+
+
+@pytest.fixture
+def spec_spy():
+    """Count how often the loader builds a module spec, i.e. re-imports"""
+    with patch(
+        "importlib.util.spec_from_file_location",
+        wraps=importlib.util.spec_from_file_location,
+    ) as spy:
+        yield spy
+
+
+class TestModuleCache:
+    """Test reuse of already loaded graph modules"""
+
+    @pytest.mark.asyncio
+    async def test_same_path_and_mtime_hits_cache(self, graph_file, spec_spy):
+        """Test that an unchanged file is not imported again"""
+        first = await AsyncModuleLoader.load_module_from_file(
+            "cached_graph", graph_file, "graph"
+        )
+        second = await AsyncModuleLoader.load_module_from_file(
+            "cached_graph", graph_file, "graph"
+        )
+
+        assert second is first
+        assert spec_spy.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_mtime_change_reloads(self, graph_file, spec_spy):
+        """Test that a modified file is imported again"""
+        first = await AsyncModuleLoader.load_module_from_file(
+            "cached_graph", graph_file, "graph"
+        )
+        mtime = graph_file.stat().st_mtime
+        os.utime(graph_file, (mtime + 10, mtime + 10))
+
+        second = await AsyncModuleLoader.load_module_from_file(
+            "cached_graph", graph_file, "graph"
+        )
+
+        assert second is not first
+        assert spec_spy.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_different_export_misses_cache(self, graph_file, spec_spy):
+        """Test that an export missing from the cached module forces a reload"""
+        await AsyncModuleLoader.load_module_from_file(
+            "cached_graph", graph_file, "graph"
+        )
+
+        with pytest.raises(ValueError, match="Graph export 'other' not found"):
+            await AsyncModuleLoader.load_module_from_file(
+                "cached_graph", graph_file, "other"
+            )
+
+        assert spec_spy.call_count == 2
+
+
+class TestRunAsyncLoaders:
+    """Test concurrent execution of async loaders"""
+
+    @pytest.mark.asyncio
+    async def test_failing_loader_does_not_stop_others(self):
+        """Test that one loader raising still lets the other loaders finish"""
+        ran = []
+
+        async def failing(module, graph_id):
+            raise RuntimeError("boom")
+
+        async def working(module, graph_id):
+            ran.append(graph_id)
+
+        await AsyncModuleLoader._run_async_loaders(
+            object(), "graph", (("failing", failing), ("working", working))
+        )
+
+        assert ran == ["graph"]
+
+    @pytest.mark.asyncio
+    async def test_cancelled_loader_is_reraised(self):
+        """Test that cancellation is propagated instead of logged as a failure"""
+
+        async def cancelled(module, graph_id):
+            raise asyncio.CancelledError
+
+        with pytest.raises(asyncio.CancelledError):
+            await AsyncModuleLoader._run_async_loaders(
+                object(), "graph", (("cancelled", cancelled),)
+            )
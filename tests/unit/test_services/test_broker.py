@@ -4,7 +4,56 @@ import asyncio
 
 import pytest
 
-from src.agent_server.services.broker import BrokerManager, RunBroker
+from src.agent_server.services.broker import BrokerManager, EventBuffer, RunBroker
+
+
+class TestEventBuffer:
+    """Test EventBuffer class"""
+
+    @pytest.mark.asyncio
+    async def test_get_returns_items_in_order(self):
+        """Test that items come out in the order they were put"""
+        buffer = EventBuffer()
+
+        buffer.put_nowait(("evt-1", 1))
+        buffer.put_nowait(("evt-2", 2))
+
+        assert buffer.qsize() == 2
+        assert await buffer.get() == ("evt-1", 1)
+        assert buffer.get_nowait() == ("evt-2", 2)
+        assert buffer.empty()
+
+    @pytest.mark.asyncio
+    async def test_get_waits_for_put(self):
+        """Test that get() wakes up when an item is put"""
+        buffer = EventBuffer()
+
+        getter = asyncio.create_task(buffer.get())
+        await asyncio.sleep(0)
+        assert not getter.done()
+
+        buffer.put_nowait(("evt-1", 1))
+
+        assert await asyncio.wait_for(getter, timeout=1.0) == ("evt-1", 1)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_getter_passes_wakeup_on(self):
+        """Test that a cancelled getter does not swallow an item's wakeup"""
+        buffer = EventBuffer()
+
+        first = asyncio.create_task(buffer.get())
+        second = asyncio.create_task(buffer.get())
+        await asyncio.sleep(0)
+
+        buffer.put_nowait(("evt-1", 1))
+        first.cancel()
+
+        assert await asyncio.wait_for(second, timeout=1.0) == ("evt-1", 1)
+
+    def test_get_nowait_on_empty_raises(self):
+        """Test that get_nowait() raises QueueEmpty when empty"""
+        with pytest.raises(asyncio.QueueEmpty):
+            EventBuffer().get_nowait()
 
 
 class TestRunBroker:
@@ -17,7 +66,7 @@ class TestRunBroker:
 
         assert broker.run_id == "run-123"
         assert broker.queue is not None
-        assert not broker.finished.is_set()
+        assert not broker.is_finished()
 
     @pytest.mark.asyncio
     async def test_put_event(self):
@@ -33,14 +82,14 @@ class TestRunBroker:
 
     @pytest.mark.asyncio
     async def test_put_end_event_marks_finished(self):
-        """Test that end event marks broker as finished"""
+        """Test that put_end marks broker as finished"""
         broker = RunBroker("run-123")
 
         # Put end event (format: tuple with 'end' as first element)
-        await broker.put("evt-end", ("end", {}))
+        await broker.put_end("evt-end", ("end", {}))
 
         # Broker should be marked as finished
-        assert broker.finished.is_set()
+        assert broker.is_finished()
 
     @pytest.mark.asyncio
     async def test_put_after_finished_warns(self):
@@ -51,8 +100,8 @@ class TestRunBroker:
         # Should not raise, just log warning
         await broker.put("evt-1", {"data": "test"})
 
-        # Queue should be empty
-        assert broker.queue.empty()
+        # No event should have been queued
+        assert broker.is_empty()
 
     @pytest.mark.asyncio
     async def test_mark_finished(self):
@@ -61,7 +110,7 @@ class TestRunBroker:
 
         broker.mark_finished()
 
-        assert broker.finished.is_set()
+        assert broker.is_finished()
 
     @pytest.mark.asyncio
     async def test_aiter_yields_events(self):
@@ -71,7 +120,7 @@ class TestRunBroker:
         # Put some events
         await broker.put("evt-1", {"data": "first"})
         await broker.put("evt-2", {"data": "second"})
-        await broker.put("evt-end", ("end", {}))
+        await broker.put_end("evt-end", ("end", {}))
 
         # Collect events
         events = []
@@ -87,11 +136,11 @@ class TestRunBroker:
 
     @pytest.mark.asyncio
     async def test_aiter_stops_on_end_event(self):
-        """Test that iteration stops on end event"""
+        """Test that iteration stops after the end event"""
         broker = RunBroker("run-123")
 
         await broker.put("evt-1", {"data": "test"})
-        await broker.put("evt-end", ("end", {}))
+        await broker.put_end("evt-end", ("end", {}))
 
         events = []
         async for event_id, payload in broker.aiter():
@@ -100,6 +149,41 @@ class TestRunBroker:
         # Should get both events including end
         assert len(events) == 2
 
+    @pytest.mark.asyncio
+    async def test_aiter_stops_when_marked_finished(self):
+        """Test that a waiting consumer stops once the broker is finished"""
+        broker = RunBroker("run-123")
+
+        await broker.put("evt-1", {"data": "test"})
+
+        async def consume():
+            return [event async for event in broker.aiter()]
+
+        consumer = asyncio.create_task(consume())
+        await asyncio.sleep(0)
+        broker.mark_finished()
+
+        events = await asyncio.wait_for(consumer, timeout=1.0)
+        assert events == [("evt-1", {"data": "test"})]
+        assert broker.is_empty()
+
+    @pytest.mark.asyncio
+    async def test_aiter_batches_groups_queued_events(self):
+        """Test that events queued together are yielded as bounded batches"""
+        broker = RunBroker("run-123")
+
+        for i in range(5):
+            await broker.put(f"evt-{i}", {"i": i})
+        await broker.put_end("evt-end", ("end", {}))
+
+        batches = [batch async for batch in broker.aiter_batches(max_batch=4)]
+
+        assert [len(batch) for batch in batches] == [4, 2]
+        assert batches[0][0] == ("evt-0", {"i": 0})
+        assert batches[-1][-1] == ("evt-end", ("end", {}))
+        # The finished marker is left for other consumers
+        assert [event async for event in broker.aiter()] == []
+
 
 class TestBrokerManager:
     """Test BrokerManager class"""
@@ -187,6 +271,45 @@ class TestBrokerManager:
         # Should no longer exist
         assert manager.get_broker("run-123") is None
 
+    @pytest.mark.asyncio
+    async def test_removed_broker_is_reused(self):
+        """Test that a drained broker is reset and reused for a new run"""
+        manager = BrokerManager()
+
+        broker = manager.get_or_create_broker("run-123")
+        await broker.put_end("evt-end", ("end", {}))
+        _ = [event async for event in broker.aiter()]
+        manager.remove_broker("run-123")
+
+        reused = manager.get_or_create_broker("run-456")
+
+        assert reused is broker
+        assert reused.run_id == "run-456"
+        assert not reused.is_finished()
+        assert reused.queue.empty()
+
+    @pytest.mark.asyncio
+    async def test_live_iterator_never_sees_another_runs_events(self):
+        """Test that a broker with an open iterator is not reused for a new run"""
+        manager = BrokerManager()
+
+        broker = manager.get_or_create_broker("run-A")
+        await broker.put("A_event_1", {"owner": "user-A"})
+        await broker.put_end("A_event_end", ("end", {}))
+
+        # A slow client pauses mid-stream holding the first batch
+        stream = broker.aiter_batches(max_batch=1)
+        assert await stream.__anext__() == [("A_event_1", {"owner": "user-A"})]
+        assert await stream.__anext__() == [("A_event_end", ("end", {}))]
+
+        manager.remove_broker("run-A")
+        other = manager.get_or_create_broker("run-B")
+        await other.put("B_event_1", {"secret": "user-B"})
+
+        assert other is not broker
+        assert [batch async for batch in stream] == []
+        assert broker._consumers == 0
+
     @pytest.mark.asyncio
     async def test_remove_nonexistent_broker(self):
         """Test removing a nonexistent broker doesn't error"""
@@ -195,6 +318,40 @@ class TestBrokerManager:
         # Should not raise
         manager.remove_broker("nonexistent")
 
+    @pytest.mark.asyncio
+    async def test_remove_expired_brokers(self):
+        """Test that only finished, drained brokers past their expiry are removed"""
+        manager = BrokerManager()
+
+        done = manager.get_or_create_broker("run-done")
+        done.mark_finished()
+        busy = manager.get_or_create_broker("run-busy")
+        expiry = busy._created_at + manager.MAX_BROKER_AGE
+
+        manager._remove_expired_brokers(busy._created_at)
+        assert manager.get_broker("run-done") is done
+
+        manager._remove_expired_brokers(expiry)
+        assert manager.get_broker("run-done") is None
+        assert manager.get_broker("run-busy") is busy
+        # The busy broker is rescheduled rather than dropped
+        assert [run_id for _, run_id in manager._expiry_heap] == ["run-busy"]
+
+    @pytest.mark.asyncio
+    async def test_cleanup_broker_schedules_removal(self):
+        """Test that a cleaned-up broker is removed after the grace period"""
+        manager = BrokerManager()
+
+        broker = manager.get_or_create_broker("run-123")
+        manager.cleanup_broker("run-123")
+
+        manager._remove_expired_brokers(broker._created_at)
+        assert manager.get_broker("run-123") is broker
+
+        grace_expiry = min(expiry for expiry, _ in manager._expiry_heap)
+        manager._remove_expired_brokers(grace_expiry)
+        assert manager.get_broker("run-123") is None
+
     @pytest.mark.asyncio
     async def test_start_and_stop_cleanup_task(self):
         """Test starting and stopping cleanup task"""
@@ -6,6 +6,7 @@ from unittest.mock import AsyncMock, Mock, mock_open, patch
 
 import pytest
 
+from agent_server.services.async_loader import AsyncModuleLoader
 from agent_server.services.langgraph_service import (
     LangGraphService,
     create_run_config,
@@ -190,6 +191,12 @@ class TestLangGraphServiceConfig:
 class TestLangGraphServiceGraphs:
     """Test graph management"""
 
+    @pytest.fixture(autouse=True)
+    def clear_module_cache(self):
+        """Keep loaded graph modules from leaking between tests"""
+        with patch.dict(AsyncModuleLoader._module_cache, clear=True):
+            yield
+
     @pytest.mark.asyncio
     async def test_get_graph_success(self):
         """Test successful graph retrieval"""
@@ -304,7 +311,7 @@ class TestLangGraphServiceGraphs:
         with (
             patch("importlib.util.spec_from_file_location") as mock_spec,
             patch("importlib.util.module_from_spec") as mock_module_from_spec,
-            patch("pathlib.Path.exists", return_value=True),
+            patch("pathlib.Path.stat", return_value=Mock(st_mtime=1.0)),
             patch("pathlib.Path.resolve", return_value=Path("/absolute/test.py")),
         ):
             mock_spec.return_value = Mock()
@@ -322,7 +329,7 @@ class TestLangGraphServiceGraphs:
         """Test error when graph file not found"""
         service = LangGraphService()
 
-        with patch("pathlib.Path.exists", return_value=False):
+        with patch("pathlib.Path.stat", side_effect=FileNotFoundError):
             graph_info = {"file_path": "missing.py", "export_name": "graph"}
 
             with pytest.raises(ValueError, match="Graph file not found"):
@@ -335,7 +342,7 @@ class TestLangGraphServiceGraphs:
 
         with (
             patch("importlib.util.spec_from_file_location", return_value=None),
-            patch("pathlib.Path.exists", return_value=True),
+            patch("pathlib.Path.stat", return_value=Mock(st_mtime=1.0)),
         ):
             graph_info = {"file_path": "test.py", "export_name": "graph"}
 
@@ -354,7 +361,7 @@ class TestLangGraphServiceGraphs:
         with (
             patch("importlib.util.spec_from_file_location") as mock_spec,
             patch("importlib.util.module_from_spec", return_value=mock_module),
-            patch("pathlib.Path.exists", return_value=True),
+            patch("pathlib.Path.stat", return_value=Mock(st_mtime=1.0)),
             patch("pathlib.Path.resolve", return_value=Path("/absolute/test.py")),
         ):
             mock_spec.return_value = Mock()